@@ -0,0 +1,917 @@
+# benchmarks.py
+# Usage: python benchmarks.py [name ...]   (no names runs everything)
+import math
+import os
+import random
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+import networkx as nx
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from bfs_engine import BFSEngine
+from csr_graph import CSRGraph
+from db_pool import ConnectionPool
+from distance_oracle import DistanceOracle
+from landmarks import LandmarkAStar, choose_landmarks
+from map_cache import cached_map, map_path
+from map_generator import connect_components, generate_map
+from map_pool import MapPool
+from matplotlib_renderer import MatplotlibRenderer
+from routing import NextHopTable
+from spatial_index import GridIndex
+from stats_buffer import StatsBuffer
+from stats_service import StatsService
+from stats_store import MYSQL_UPSERT, MemoryStatsStore, SQLStatsStore, SQLiteStatsStore, stats_delta
+
+
+def map_radius(nodes):
+    """Radius that keeps a random geometric map of this size mostly connected."""
+    return 0.2 if nodes <= 24 else 1.5 * math.sqrt(math.log(nodes) / (math.pi * nodes))
+
+
+def build_map(nodes, seed=42):
+    """Connected, weighted networkx map with 'pos' node attributes."""
+    game_map = generate_map(nodes, map_radius(nodes), seed=seed)
+    G = game_map.to_networkx()
+    nx.set_node_attributes(G, game_map.layout(), 'pos')
+    return G
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_distance(sizes=(24, 5000), turns=200):
+    """Per-turn distance cost: one sanity-penalty query plus a ghost placement retry."""
+    for nodes in sizes:
+        G = build_map(nodes)
+        rng = random.Random(0)
+        queries = [(rng.randrange(nodes), rng.randrange(nodes)) for _ in range(3 * turns)]
+
+        def networkx_turns():
+            for u, v in queries:
+                nx.shortest_path_length(G, u, v)
+
+        start = time.perf_counter()
+        oracle = DistanceOracle(CSRGraph.from_networkx(G))
+        build = time.perf_counter() - start
+
+        def oracle_turns():
+            for u, v in queries:
+                oracle.distance(u, v)
+
+        before = timed(networkx_turns, 1) / turns
+        after = timed(oracle_turns, 5) / turns
+        print(f"distance  {nodes:>6} nodes: networkx {before * 1e6:9.1f} us/turn, "
+              f"oracle {after * 1e6:7.2f} us/turn, table build {build:.2f} s")
+
+
+def bench_routing(sizes=(24, 5000), moves=200):
+    """Ghost steps toward a player who keeps revisiting a small part of the map."""
+    for nodes in sizes:
+        G = build_map(nodes)
+        rng = random.Random(0)
+        goals = [rng.randrange(nodes) for _ in range(20)]
+        steps = [(rng.randrange(nodes), rng.choice(goals)) for _ in range(moves)]
+
+        def networkx_moves():
+            for start, goal in steps:
+                nx.dijkstra_path(G, start, goal)
+
+        table = NextHopTable(CSRGraph.from_networkx(G), weighted=True)
+
+        def table_moves():
+            for start, goal in steps:
+                table.next_hop(start, goal)
+
+        before = timed(networkx_moves, 1) / moves
+        cold = timed(table_moves, 1) / moves
+        warm = timed(table_moves, 5) / moves
+        print(f"routing   {nodes:>6} nodes: networkx {before * 1e6:9.1f} us/move, "
+              f"table cold {cold * 1e6:9.1f} us/move, warm {warm * 1e6:7.2f} us/move")
+
+
+def path_copy_bfs(G, start, goal):
+    """The original Game.bfs_pathfinding search, kept as the baseline."""
+    visited = set()
+    queue = deque([(start, [start])])
+    while queue:
+        current, path = queue.popleft()
+        if current == goal:
+            return path[1] if len(path) > 1 else start
+        if current in visited:
+            continue
+        visited.add(current)
+        for neighbor in G.neighbors(current):
+            if neighbor not in visited:
+                queue.append((neighbor, path + [neighbor]))
+    return start
+
+
+def bench_bfs(sizes=(24, 1000, 5000), queries=50):
+    """Single ghost step by BFS: path-copying search vs the parent-pointer engine."""
+    for nodes in sizes:
+        G = build_map(nodes)
+        rng = random.Random(0)
+        pairs = [(rng.randrange(nodes), rng.randrange(nodes)) for _ in range(queries)]
+        engine = BFSEngine(CSRGraph.from_networkx(G))
+
+        def baseline():
+            for start, goal in pairs:
+                path_copy_bfs(G, start, goal)
+
+        def engine_steps():
+            for start, goal in pairs:
+                engine.next_hop(start, goal)
+
+        before = timed(baseline, 1) / queries
+        after = timed(engine_steps, 3) / queries
+        print(f"bfs       {nodes:>6} nodes: path copy {before * 1e6:9.1f} us/query, "
+              f"engine {after * 1e6:9.1f} us/query")
+
+
+def bench_alt(sizes=(10000,), queries=30):
+    """Hard-mode A*: node expansions and time per query by heuristic."""
+    for nodes in sizes:
+        G = build_map(nodes)
+        pos = nx.get_node_attributes(G, 'pos')
+        rng = random.Random(0)
+        pairs = [(rng.randrange(nodes), rng.randrange(nodes)) for _ in range(queries)]
+        graph = CSRGraph.from_networkx(G)
+        start = time.perf_counter()
+        _, table = choose_landmarks(graph)
+        build = time.perf_counter() - start
+        searches = {
+            'none (Dijkstra)': LandmarkAStar(graph, landmark_count=0),
+            'euclidean': LandmarkAStar(graph, pos=pos, landmark_count=0),
+            'ALT': LandmarkAStar(graph, table=table),
+            'ALT + euclidean': LandmarkAStar(graph, pos=pos, table=table),
+        }
+
+        def networkx_queries():
+            for u, v in pairs:
+                nx.astar_path(G, u, v, weight='weight')
+
+        print(f"alt       {nodes:>6} nodes: nx.astar_path {timed(networkx_queries, 1) / queries * 1e3:8.2f} ms/query"
+              f" (landmark build {build:.2f} s)")
+        for name, search in searches.items():
+            def queries_with(search=search):
+                for u, v in pairs:
+                    search.path(u, v)
+            elapsed = timed(queries_with, 1) / queries
+            print(f"          heuristic {name:<16} {search.total_expansions / search.queries:9.0f} expansions/query,"
+                  f" {elapsed * 1e3:8.2f} ms/query")
+
+
+def bench_csr(sizes=(24, 5000), turns=200):
+    """Memory per node and per-turn latency: networkx dict-of-dicts vs CSRGraph.
+
+    A turn is what a Hard-mode click does: validate the move, step the
+    ghost toward the player by A* and measure the ghost's hop distance.
+    """
+    for nodes in sizes:
+        tracemalloc.start()
+        G = build_map(nodes)
+        nx_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        graph = CSRGraph.from_networkx(G)
+        rng = random.Random(0)
+        clicks = []
+        for _ in range(turns):
+            player = rng.randrange(nodes)
+            clicks.append((player, rng.choice(list(G.neighbors(player))), rng.randrange(nodes)))
+
+        def networkx_turns():
+            for player, target, ghost in clicks:
+                target in [n for n in G.neighbors(player)]
+                nx.astar_path(G, ghost, target, weight='weight')
+                nx.shortest_path_length(G, target, ghost)
+
+        oracle = DistanceOracle(graph)
+        astar = LandmarkAStar(graph, pos=nx.get_node_attributes(G, 'pos'))
+
+        def csr_turns():
+            for player, target, ghost in clicks:
+                graph.has_edge(player, target)
+                astar.next_hop(ghost, target)
+                oracle.distance(target, ghost)
+
+        before = timed(networkx_turns, 1) / turns
+        after = timed(csr_turns, 1) / turns
+        print(f"csr       {nodes:>6} nodes: networkx {nx_bytes / nodes:7.0f} B/node {before * 1e6:9.1f} us/turn, "
+              f"csr {graph.nbytes() / nodes:5.0f} B/node {after * 1e6:9.1f} us/turn")
+
+
+def networkx_map(nodes, seed=42):
+    """The original visualize_game_state pipeline, kept as the baseline."""
+    G = nx.random_geometric_graph(nodes, map_radius(nodes), seed=seed)
+    pos = nx.spring_layout(G, k=2, seed=42)
+    for u, v in list(G.edges()):
+        x1, y1 = pos[u]
+        x2, y2 = pos[v]
+        G[u][v]['weight'] = round(((x2 - x1)**2 + (y2 - y1)**2)**0.5, 2)
+    return G, pos
+
+
+def bench_mapgen(baseline_sizes=(24, 500), sizes=(24, 500, 10000, 100000, 1000000)):
+    """Map generation time: networkx + spring_layout vs the grid-hash generator."""
+    for nodes in baseline_sizes:
+        elapsed = timed(lambda: networkx_map(nodes), 1)
+        print(f"mapgen    {nodes:>7} nodes: networkx + spring_layout {elapsed:8.3f} s")
+    for nodes in sizes:
+        elapsed = timed(lambda: generate_map(nodes, map_radius(nodes), seed=42), 1)
+        print(f"mapgen    {nodes:>7} nodes: generate_map {elapsed:8.3f} s")
+
+
+def old_repair(G, rng):
+    """The original connectivity loop from visualize_game_state, kept as the baseline."""
+    while not nx.is_connected(G):
+        largest_cc = max(nx.connected_components(G), key=len)
+        for node in G.nodes():
+            if node not in largest_cc:
+                G.add_edge(node, rng.choice(list(largest_cc)))
+
+
+def bench_repair(sizes=(24, 2000, 20000, 200000)):
+    """Connectivity repair: old loop vs union-find + nearest-component bridges, and bridge lengths.
+
+    That every repaired map is connected is checked by tests/test_map_generator.py.
+    """
+    for nodes in sizes:
+        radius = 0.6 * map_radius(nodes)
+        positions = np.random.default_rng(0).random((nodes, 2))
+        index = GridIndex(positions, radius)
+        u, v = index.pairs_within(radius)
+        if nodes <= 20000:
+            G = nx.Graph()
+            G.add_nodes_from(range(nodes))
+            G.add_edges_from(zip(u.tolist(), v.tolist()))
+            before = set(G.edges())
+            old = timed(lambda: old_repair(G, random.Random(0)), 1)
+            added = [math.dist(positions[a], positions[b]) for a, b in set(G.edges()) - before]
+            old_text = f"old loop {old:8.3f} s, longest bridge {max(added, default=0.0):.3f}"
+        else:
+            old_text = "old loop  (skipped)"
+        start = time.perf_counter()
+        bridge_u, bridge_v = connect_components(positions, u, v, index)
+        new = time.perf_counter() - start
+        longest = np.hypot(*(positions[bridge_u] - positions[bridge_v]).T).max(initial=0.0)
+        print(f"repair    {nodes:>7} nodes: {old_text}, union-find {new:8.3f} s, "
+              f"{bridge_u.size} bridges, longest {longest:.3f}")
+
+
+def bench_mapcache(sizes=(24, 5000, 100000, 1000000)):
+    """Game start cost: generating a map (and its distance table) vs memory-mapping it."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for nodes in sizes:
+            radius = map_radius(nodes)
+            cold = timed(lambda: cached_map(nodes, radius, seed=1, cache_dir=cache_dir), 1)
+            warm = timed(lambda: cached_map(nodes, radius, seed=1, cache_dir=cache_dir), 5)
+            size = os.path.getsize(map_path(nodes, radius, 1, cache_dir))
+            print(f"mapcache  {nodes:>7} nodes: generate + save {cold:8.3f} s, "
+                  f"load {warm * 1e3:8.3f} ms, file {size / 2**20:8.1f} MiB")
+
+
+def bench_mappool(nodes=100000, depth=4, takes=8):
+    """Game-start latency with a background map pool vs generating on the spot."""
+    radius = map_radius(nodes)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        direct = timed(lambda: cached_map(nodes, radius, seed=random.getrandbits(63), cache_dir=cache_dir), 1)
+        pool = MapPool({1: (nodes, radius)}, depth=depth)
+        while pool.stats()['ready'][1] < depth:
+            time.sleep(0.05)
+        waits = []
+        for _ in range(takes):
+            start = time.perf_counter()
+            pool.take(1)
+            waits.append(time.perf_counter() - start)
+            time.sleep(direct / 2)
+        stats = pool.stats()
+        pool.close()
+    print(f"mappool   {nodes:>7} nodes: on the spot {direct:8.3f} s, from pool "
+          f"median {sorted(waits)[len(waits) // 2] * 1e3:8.3f} ms, worst {max(waits):8.3f} s")
+    print(f"          ready {stats['ready'][1]}, pending {stats['pending'][1]}, generated {stats['generated']}, "
+          f"{stats['maps_per_second']:.2f} maps/s, {stats['mean_build_seconds']:.3f} s/map per worker")
+
+
+def bench_click(sizes=(24, 10000, 1000000), clicks=200, hit_radius=0.05):
+    """Click-to-node lookup: min over every node vs the layout's grid index."""
+    for nodes in sizes:
+        game_map = generate_map(nodes, map_radius(nodes), seed=42)
+        pos = game_map.layout()
+        rng = np.random.default_rng(0)
+        points = rng.random((clicks, 2)).tolist()
+        repeat = 1 if nodes > 10000 else 5
+        scanned = 5 if nodes > 10000 else clicks
+
+        def scan_clicks():
+            for x, y in points[:scanned]:
+                distances = {node: ((p[0] - x) ** 2 + (p[1] - y) ** 2) for node, p in pos.items()}
+                min(distances, key=distances.get)
+
+        start = time.perf_counter()
+        index = GridIndex(game_map.positions, min(hit_radius, game_map.radius))
+        build = time.perf_counter() - start
+
+        def index_clicks():
+            for point in points:
+                index.nearest(point, max_distance=hit_radius)
+
+        before = timed(scan_clicks, repeat) / scanned
+        after = timed(index_clicks, repeat) / clicks
+        hits = sum(index.nearest(point, max_distance=hit_radius) >= 0 for point in points)
+        print(f"click     {nodes:>7} nodes: scan {before * 1e6:11.1f} us/click, "
+              f"index {after * 1e6:6.1f} us/click, build {build * 1e3:7.1f} ms, {hits}/{clicks} hits")
+
+
+def render_game(nodes, difficulty=3, networkx=True):
+    """Stand-in for a Game with just what the renderers read."""
+    game_map = generate_map(nodes, map_radius(nodes), seed=42)
+    return types.SimpleNamespace(G=game_map.to_networkx() if networkx else None, graph=game_map.graph,
+                                 pos=game_map.layout(), difficulty=difficulty,
+                                 player_position=1, ghost_position=2, sanity=100, current_score=0)
+
+
+def full_redraw(game):
+    """The old visualize_game_state: clear the figure and draw every layer again."""
+    plt.clf()
+    nx.draw_networkx_edges(game.G, game.pos, edge_color='gray', width=1, alpha=0.5)
+    nx.draw_networkx_nodes(game.G, game.pos, node_color='white', node_size=500, edgecolors='gray')
+    nx.draw_networkx_nodes(game.G, game.pos, nodelist=[game.player_position-1],
+                           node_color='green', node_size=700, node_shape='o')
+    nx.draw_networkx_nodes(game.G, game.pos, nodelist=[game.ghost_position-1],
+                           node_color='red', node_size=700, node_shape='h')
+    nx.draw_networkx_labels(game.G, game.pos, {i: str(i+1) for i in game.G.nodes()})
+    if game.difficulty == 3:
+        edge_labels = {edge: f"{weight:.2f}" for edge, weight in nx.get_edge_attributes(game.G, 'weight').items()}
+        nx.draw_networkx_edge_labels(game.G, game.pos, edge_labels=edge_labels, font_size=8, font_color='blue')
+    plt.text(0.02, 0.004, f'Sanity: {game.sanity}', transform=plt.gca().transAxes)
+    plt.text(0.02, 0.057, f'Current Score: {game.current_score}', transform=plt.gca().transAxes)
+    plt.axis('off')
+
+
+def bench_render(sizes=(24, 500), turns=5):
+    """Per-move artist work (excluding rasterising): full redraw vs retained renderer."""
+    for nodes in sizes:
+        game = render_game(nodes)
+        steps = [(1 + t % nodes, 1 + (t * 7) % nodes) for t in range(turns)]
+
+        def move(update):
+            for game.player_position, game.ghost_position in steps:
+                update()
+
+        plt.figure(figsize=(10, 10))
+        before = timed(lambda: move(lambda: full_redraw(game)), 1) / turns
+        plt.close('all')
+
+        plt.figure(figsize=(10, 10))
+        start = time.perf_counter()
+        renderer = MatplotlibRenderer(game)
+        build = time.perf_counter() - start
+        after = timed(lambda: move(lambda: renderer.update(game)), 5) / turns
+        plt.close('all')
+        print(f"render    {nodes:>7} nodes: full redraw {before * 1e3:9.2f} ms/move, "
+              f"retained {after * 1e3:6.3f} ms/move, one-off build {build * 1e3:8.1f} ms")
+
+
+def bench_frame(sizes=(24, 500), turns=10):
+    """Whole frame (artist update + rasterise) on Agg: full canvas draw vs blitting."""
+    for nodes in sizes:
+        game = render_game(nodes)
+        steps = [(1 + t % nodes, 1 + (t * 7) % nodes) for t in range(turns)]
+        frames = {}
+        for blit in (False, True):
+            plt.figure(figsize=(10, 10))
+            renderer = MatplotlibRenderer(game, blit=blit)
+            renderer.update(game)
+            renderer.canvas.draw()
+
+            def move():
+                for game.player_position, game.ghost_position in steps:
+                    renderer.update(game)
+                    if blit:
+                        renderer.present()
+                    else:
+                        renderer.canvas.draw()
+
+            frames[blit] = timed(move, 1) / turns
+            plt.close('all')
+        print(f"frame     {nodes:>7} nodes: full draw {frames[False] * 1e3:8.2f} ms/frame, "
+              f"blit {frames[True] * 1e3:6.2f} ms/frame")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (0 where unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def bench_hud(turns=10000, checkpoint=1000):
+    """Headless long session: frame time, artist count and peak RSS.
+
+    tests/test_hud.py checks that the artist count and peak RSS stay flat
+    over 10,000 Game turns (run it with --runslow).
+    """
+    game = render_game(24)
+    rng = random.Random(0)
+    plt.figure(figsize=(4, 4))
+    renderer = MatplotlibRenderer(game)
+    ax = renderer.ax
+    start = time.perf_counter()
+    for turn in range(1, turns + 1):
+        renderer.messages.next_turn()
+        game.player_position, game.ghost_position = rng.randint(1, 24), rng.randint(1, 24)
+        game.sanity, game.current_score = rng.randint(1, 100), 10 * turn
+        for _ in range(rng.randint(0, 4)):
+            renderer.messages.post(f"message {turn}", rng.choice(['blue', 'red', 'green']))
+        renderer.update(game)
+        renderer.present()
+        if turn == checkpoint:
+            artists, rss = len(ax.get_children()), peak_rss_mb()
+    elapsed = time.perf_counter() - start
+    final_artists, final_rss = len(ax.get_children()), peak_rss_mb()
+    plt.close('all')
+    print(f"hud       {turns} turns: artists {artists} at turn {checkpoint} -> {final_artists}, "
+          f"peak RSS {rss:.1f} -> {final_rss:.1f} MB, {elapsed / turns * 1e3:.2f} ms/turn")
+
+
+def bench_pygame(sizes=(24, 5000, 50000), frames=300):
+    """Uncapped pygame frames on the dummy video driver: full repaint vs dirty rects."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from pygame_renderer import PygameRenderer
+    for nodes in sizes:
+        game = render_game(nodes, difficulty=3)
+        start = time.perf_counter()
+        renderer = PygameRenderer(game, fps=0)
+        build = time.perf_counter() - start
+        rng = random.Random(0)
+        steps = [(rng.randint(1, nodes), rng.randint(1, nodes)) for _ in range(frames)]
+
+        def play(full):
+            for game.player_position, game.ghost_position in steps:
+                renderer.update(game)
+                if full:
+                    renderer.screen.blit(renderer.background, (0, 0))
+                    renderer.dirty = [renderer.screen.get_rect()]
+                renderer.present()
+
+        full = timed(lambda: play(True), 1) / frames
+        dirty = timed(lambda: play(False), 1) / frames
+        pygame.display.quit()
+        print(f"pygame    {nodes:>7} nodes: full repaint {1 / full:7.0f} fps, "
+              f"dirty rects {1 / dirty:7.0f} fps, map pre-render {build * 1e3:7.1f} ms")
+
+
+def bench_lod(sizes=(24, 10000, 100000, 1000000), zooms=(1, 10, 100)):
+    """Full redraw of the matplotlib view (view change) at several zoom levels."""
+    for nodes in sizes:
+        game = render_game(nodes, networkx=False)
+        plt.figure(figsize=(10, 10))
+        start = time.perf_counter()
+        renderer = MatplotlibRenderer(game)
+        build = time.perf_counter() - start
+        low, high = renderer.full_view
+        centre = (low + high) / 2
+        results = []
+        for zoom in zooms:
+            half = (high - low) / (2 * zoom)
+            start = time.perf_counter()
+            renderer.set_view(centre - half, centre + half)
+            layout = time.perf_counter() - start
+            draw = timed(renderer.canvas.draw, 3)
+            results.append(f"x{zoom} {layout * 1e3:6.1f}+{draw * 1e3:6.1f}")
+        plt.close('all')
+        print(f"lod       {nodes:>7} nodes: build {build:6.2f} s, layout+draw ms: " + ", ".join(results))
+
+
+def bench_sounds(plays=50):
+    """Sound effect latency on the dummy audio driver: decode per play vs SoundBank."""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from sound_bank import SoundBank
+    bank = SoundBank()
+    start = time.perf_counter()
+    bank.preload()
+    preload = time.perf_counter() - start
+    if bank.silent:
+        print("sounds    no audio device, skipped")
+        return
+    for name in sorted(bank.files):
+        path = bank.files[name]
+        decode = timed(lambda: pygame.mixer.Sound(path).play(), 5)
+        cached = timed(lambda: bank.play(name), plays)
+        print(f"sounds    {name:>12}: decode+play {decode * 1e3:7.2f} ms, bank play {cached * 1e3:7.3f} ms")
+    print(f"sounds    preload {len(bank.files)} files {preload * 1e3:7.1f} ms")
+    pygame.mixer.quit()
+
+
+GUI_AUDIO_MODULES = ('matplotlib', 'tkinter', 'PIL', 'pygame', 'playsound')
+# What each startup imports; "eager" is final2's old set of top-level imports.
+STARTUPS = {
+    'eager': "import numpy, networkx, matplotlib.pyplot, tkinter, PIL.ImageTk, pygame; import final2",
+    'headless': "import final2; final2.load_renderer('text')",
+    'matplotlib': "import final2; final2.load_renderer('matplotlib')",
+    'pygame': "import final2; final2.load_renderer('pygame')",
+}
+
+
+def import_times(code):
+    """Import time of a fresh interpreter running `code`, by root package: {package: s}.
+
+    Also returns the last line `code` printed.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if line.startswith('import time:') and fields[0].split(':')[1].strip().isdigit():
+            package = fields[2].strip().split('.')[0]
+            packages[package] = packages.get(package, 0.0) + int(fields[0].split(':')[1]) / 1e6
+    return packages, (result.stdout.splitlines() or [''])[-1]
+
+
+def bench_imports(repeat=3, top=6):
+    """Cold-start import time per entry point, with the packages that cost the most."""
+    probe = f"; import sys; print(*sorted({{m.split('.')[0] for m in sys.modules}} & set({GUI_AUDIO_MODULES!r})))"
+    for name, code in STARTUPS.items():
+        packages, loaded = min((import_times(code + probe) for _ in range(repeat)),
+                               key=lambda run: sum(run[0].values()))
+        slowest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+        print(f"imports   {name:>10}: {sum(packages.values()) * 1e3:7.1f} ms, "
+              f"GUI/audio modules: {loaded or 'none'}")
+        print("          " + ", ".join(f"{package} {seconds * 1e3:.1f}" for package, seconds in slowest))
+
+
+def bench_loading(nodes=20000):
+    """Loading screen: splash resize vs cached copy; warm-up tasks one after another vs in parallel."""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from PIL import Image
+    from loading_screen import SPLASH_IMAGE, SPLASH_SIZE, splash_path, warm_up
+    from sound_bank import SoundBank
+    with tempfile.TemporaryDirectory() as cache_dir:
+        source = shutil.copy(SPLASH_IMAGE, cache_dir)
+        resize = timed(lambda: Image.open(source).resize(SPLASH_SIZE), 3)
+        first = timed(lambda: splash_path(source), 1)
+        cached = timed(lambda: splash_path(source), 100)
+        print(f"loading   splash: resize every launch {resize * 1e3:7.1f} ms, "
+              f"first cached {first * 1e3:7.1f} ms, cached {cached * 1e3:7.3f} ms")
+        SoundBank().preload()
+        settings = {difficulty: (nodes, map_radius(nodes)) for difficulty in (1, 2, 3)}
+        for parallel in (False, True):
+            start = time.perf_counter()
+            pool = MapPool(settings, depth=1)
+            tasks = [("Preparing maps", pool.wait), ("Loading sounds", SoundBank().preload)]
+            if parallel:
+                warm_up(tasks, splash=False)
+            else:
+                for _, task in tasks:
+                    task()
+            pool.close()
+            print(f"loading   {nodes:>7} nodes, {'parallel' if parallel else 'serial':>8} warm-up: "
+                  f"{time.perf_counter() - start:6.2f} s (old splash: fixed 3 s, then the work)")
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    """Server side of the database stand-in: greeting, auth, then one reply per request line."""
+
+    requests = 0
+    # Seconds each reply is held back, as a stand-in for network latency.
+    delay = 0.0
+
+    def handle(self):
+        self.wfile.write(b"GREETING\n")
+        self.wfile.flush()
+        if not self.rfile.readline():
+            return
+        self.wfile.write(b"OK\n")
+        self.wfile.flush()
+        for line in self.rfile:
+            StandInHandler.requests += 1
+            if StandInHandler.delay:
+                time.sleep(StandInHandler.delay)
+            self.wfile.write(b"OK " + line.split()[0] + b"\n")
+            self.wfile.flush()
+
+
+class StandInConnection:
+    """Client for StandInHandler with the round trips of a MySQL session.
+
+    Connecting costs a TCP handshake plus greeting/auth exchange; every
+    query, prepare, execute, commit and ping is one round trip.
+    """
+
+    def __init__(self, address):
+        self.sock = socket.create_connection(address)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rwb')
+        self.file.readline()
+        self.request(b"AUTH")
+
+    def request(self, command):
+        self.file.write(command + b"\n")
+        self.file.flush()
+        return self.file.readline()
+
+    def cursor(self, prepared=False):
+        return StandInCursor(self, prepared)
+
+    def commit(self):
+        self.request(b"COMMIT")
+
+    def rollback(self):
+        self.request(b"ROLLBACK")
+
+    def start_transaction(self):
+        self.request(b"BEGIN")
+
+    def ping(self, reconnect=False):
+        self.request(b"PING")
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class StandInCursor:
+    def __init__(self, conn, prepared):
+        self.conn = conn
+        self.prepared = prepared
+        self.statement = None
+
+    def execute(self, sql, params=()):
+        if not self.prepared:
+            self.conn.request(b"QUERY")
+            return
+        if sql != self.statement:
+            self.conn.request(b"PREPARE")
+            self.statement = sql
+        self.conn.request(b"EXECUTE")
+
+    def executemany(self, sql, seq_of_params):
+        for params in seq_of_params:
+            self.execute(sql, params)
+
+    def fetchall(self):
+        return [(0, 0, 0, 0)]
+
+    def close(self):
+        pass
+
+
+def start_stand_in():
+    """A StandInHandler server on a free local port, served from a daemon thread."""
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_dbpool(calls=500):
+    """Stats load/save latency on a local stand-in server: new connection per call vs pool."""
+    sql = "SELECT games_played, total_score, best_score, hearts_of_dead FROM user_stats WHERE player_name = %s"
+    server = start_stand_in()
+    address = server.server_address
+
+    def per_call():
+        conn = StandInConnection(address)
+        cursor = conn.cursor()
+        cursor.execute(sql, ("tester",))
+        cursor.fetchall()
+        conn.commit()
+        conn.close()
+
+    connect = timed(lambda: StandInConnection(address).close(), calls)
+    before = timed(per_call, calls)
+    results = [f"dbpool    connect {connect * 1e3:6.3f} ms, connect+query+commit+close {before * 1e3:6.3f} ms/call"]
+    for check_after in (30.0, 0.0):
+        pool = ConnectionPool(lambda: StandInConnection(address), size=4,
+                              prepare=lambda raw: raw.cursor(prepared=True),
+                              ping=lambda raw: raw.ping(), check_after=check_after)
+
+        def pooled():
+            with pool.connection() as db:
+                db.execute(sql, ("tester",)).fetchall()
+                db.commit()
+
+        after = timed(pooled, calls)
+        stats = pool.stats()
+        pool.close()
+        results.append(f"dbpool    pooled (ping after {check_after:g} s idle) {after * 1e3:6.3f} ms/call, "
+                       f"{stats['opened']} opened, {stats['reused']} reused")
+    server.shutdown()
+    server.server_close()
+    print("\n".join(results))
+
+
+def bench_stats(calls=2000):
+    """One game's stats round trip (load then add) on each embedded backend."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, store in (("memory", MemoryStatsStore()),
+                            ("sqlite", SQLiteStatsStore(os.path.join(directory, "stats.db")))):
+            players = iter(range(calls * 10))
+
+            def new_player():
+                store.load(f"player{next(players)}")
+
+            def game():
+                store.load("tester")
+                store.add("tester", stats_delta(games_played=1, total_score=10, best_score=10))
+
+            first = timed(new_player, calls)
+            again = timed(game, calls)
+            store.close()
+            results.append(f"stats     {name:6} new player {first * 1e3:6.3f} ms, load+add {again * 1e3:6.3f} ms")
+    print("\n".join(results))
+
+
+def bench_upsert(games=1000, sessions=4):
+    """A game's stats writes on SQLite: SELECT/INSERT then full-row UPDATE (old) vs one delta upsert.
+
+    Also lets `sessions` sessions of one player load their stats before
+    any of them saves a game, and counts the games that were kept.
+    """
+    fields = "games_played, total_score, best_score, hearts_of_dead"
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteStatsStore(os.path.join(directory, "stats.db"))
+        names = iter(range(games * 10))
+
+        def old_load(db, player):
+            rows = db.execute(f"SELECT {fields} FROM user_stats WHERE player_name = ?", (player,)).fetchall()
+            if rows:
+                return rows[0]
+            db.execute("INSERT INTO user_stats (player_name) VALUES (?)", (player,))
+            return (0, 0, 0, 0)
+
+        def old_save(db, player, stats):
+            played, total, best, hearts = stats
+            db.execute("UPDATE user_stats SET games_played = ?, total_score = ?, best_score = ?, "
+                       "hearts_of_dead = ? WHERE player_name = ?",
+                       (played + 1, total + 10, max(best, 10), hearts, player))
+
+        def old_game():
+            player = f"old{next(names)}"
+            with store.pool.connection() as db:
+                old_save(db, player, old_load(db, player))
+
+        def new_game():
+            player = f"new{next(names)}"
+            store.load(player)
+            store.add(player, stats_delta(games_played=1, total_score=10, best_score=10))
+
+        before = timed(old_game, games)
+        after = timed(new_game, games)
+        with store.pool.connection() as db:
+            loaded = [old_load(db, "old-shared") for _ in range(sessions)]
+            for stats in loaded:
+                old_save(db, "old-shared", stats)
+        for _ in range(sessions):
+            store.load("new-shared")
+        for _ in range(sessions):
+            store.add("new-shared", stats_delta(games_played=1, total_score=10, best_score=10))
+        kept_old = store.load("old-shared")['games_played']
+        kept_new = store.load("new-shared")['games_played']
+        store.close()
+    print(f"upsert    new player's game: SELECT+INSERT+UPDATE {before * 1e3:6.3f} ms, SELECT+upsert {after * 1e3:6.3f} ms\n"
+          f"upsert    {sessions} overlapping sessions: UPDATE kept {kept_old} games, upsert kept {kept_new}")
+
+
+def bench_writebehind(games=2000, players=50):
+    """Game-over stats writes: one upsert per game vs the StatsBuffer journal and batched flushes.
+
+    Runs on SQLite and on the stand-in MySQL server; the caller's time per
+    game and the total including the final flush are reported.
+    """
+    server = start_stand_in()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        backends = (
+            ("sqlite", lambda: SQLiteStatsStore(os.path.join(directory, "stats.db"))),
+            ("server", lambda: SQLStatsStore(
+                ConnectionPool(lambda: StandInConnection(server.server_address),
+                               prepare=lambda raw: raw.cursor(prepared=True)),
+                "%s", MYSQL_UPSERT, OSError, begin=lambda raw: raw.start_transaction())),
+        )
+        for name, open_store in backends:
+            store = open_store()
+            StandInHandler.requests = 0
+            deltas = [(f"player{i % players}", stats_delta(games_played=1, total_score=i % 97, best_score=i % 97))
+                      for i in range(games)]
+            start = time.perf_counter()
+            for player, delta in deltas:
+                store.add(player, delta)
+            direct = (time.perf_counter() - start) / games
+            direct_requests = StandInHandler.requests
+            buffer = StatsBuffer(store, os.path.join(directory, f"{name}.jsonl"), flush_every=0.05)
+            start = time.perf_counter()
+            for player, delta in deltas:
+                buffer.add(player, delta)
+            acknowledged = (time.perf_counter() - start) / games
+            buffer.close()
+            total = (time.perf_counter() - start) / games
+            results.append(f"writebehind {name}: upsert per game {direct * 1e3:6.3f} ms; buffered add "
+                           f"{acknowledged * 1e3:6.3f} ms, {total * 1e3:6.3f} ms with flushes\n"
+                           f"writebehind {name}: {buffer.report()}")
+            if name == "server":
+                results.append(f"writebehind server requests for {games} games: {direct_requests} direct, "
+                               f"{StandInHandler.requests - direct_requests} buffered")
+    server.shutdown()
+    server.server_close()
+    print("\n".join(results))
+
+
+def bench_statsservice(latency=0.002, splash=0.05, games=20):
+    """Time the caller spends on stats I/O with a server `latency` s away: direct calls vs StatsService.
+
+    With the service the player's row is prefetched and the game waits
+    for it after `splash` seconds, as when it is loaded behind the splash.
+    """
+    server = start_stand_in()
+    StandInHandler.delay = latency
+
+    def open_store():
+        return SQLStatsStore(ConnectionPool(lambda: StandInConnection(server.server_address),
+                                            prepare=lambda raw: raw.cursor(prepared=True)),
+                             "%s", MYSQL_UPSERT, OSError, begin=lambda raw: raw.start_transaction())
+
+    delta = stats_delta(games_played=1, total_score=10, best_score=10)
+    store = open_store()
+    start = time.perf_counter()
+    store.load("tester")
+    direct_load = time.perf_counter() - start
+    direct_add = timed(lambda: store.add("tester", delta), games)
+    store.close()
+
+    service = StatsService(open_store)
+    service.prefetch("tester")
+    time.sleep(splash)
+    start = time.perf_counter()
+    service.load("tester").result()
+    service_load = time.perf_counter() - start
+    start = time.perf_counter()
+    futures = [service.add("tester", delta) for _ in range(games)]
+    service_add = (time.perf_counter() - start) / games
+    start = time.perf_counter()
+    for future in futures:
+        future.result()
+    drained = time.perf_counter() - start
+    service.close()
+    StandInHandler.delay = 0.0
+    server.shutdown()
+    server.server_close()
+    print(f"statsservice first load: direct {direct_load * 1e3:6.2f} ms, prefetched {service_load * 1e3:6.3f} ms\n"
+          f"statsservice game-over add: direct {direct_add * 1e3:6.2f} ms, service {service_add * 1e3:6.3f} ms "
+          f"(done on the stats thread {drained * 1e3:.1f} ms later)")
+
+
+BENCHMARKS = {
+    'distance': bench_distance,
+    'routing': bench_routing,
+    'bfs': bench_bfs,
+    'alt': bench_alt,
+    'csr': bench_csr,
+    'mapgen': bench_mapgen,
+    'repair': bench_repair,
+    'mapcache': bench_mapcache,
+    'mappool': bench_mappool,
+    'click': bench_click,
+    'render': bench_render,
+    'frame': bench_frame,
+    'hud': bench_hud,
+    'pygame': bench_pygame,
+    'lod': bench_lod,
+    'sounds': bench_sounds,
+    'imports': bench_imports,
+    'loading': bench_loading,
+    'dbpool': bench_dbpool,
+    'stats': bench_stats,
+    'upsert': bench_upsert,
+    'writebehind': bench_writebehind,
+    'statsservice': bench_statsservice,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
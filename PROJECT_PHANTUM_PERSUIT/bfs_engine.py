@@ -0,0 +1,81 @@
+# bfs_engine.py
+from array import array
+import numpy as np
+
+
+class BFSEngine:
+    """Breadth-first search over a CSRGraph with reusable buffers.
+
+    Parent, depth and queue storage is allocated once per map. Each search
+    bumps a generation number instead of clearing the visited marks, so a
+    search costs only the nodes it actually touches.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.node_count = graph.node_count
+        blank = array('l', [0]) * self.node_count
+        self.parent = array('l', blank)
+        self.depth = array('l', blank)
+        self.stamp = array('l', blank)
+        self.queue = array('l', blank)
+        self.generation = 0
+
+    def search(self, source, target=-1):
+        """BFS from source, stopping as soon as target is discovered.
+
+        Returns True if target was reached (always False for a full sweep
+        with the default target). Afterwards parent/depth are valid for
+        every node where reached() is True.
+        """
+        self.generation += 1
+        gen = self.generation
+        indptr, indices = self.graph.offsets, self.graph.targets
+        parent, depth, stamp, queue = self.parent, self.depth, self.stamp, self.queue
+        stamp[source] = gen
+        parent[source] = source
+        depth[source] = 0
+        if source == target:
+            return True
+        queue[0] = source
+        head, tail = 0, 1
+        while head < tail:
+            current = queue[head]
+            head += 1
+            next_depth = depth[current] + 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if stamp[neighbor] != gen:
+                    stamp[neighbor] = gen
+                    parent[neighbor] = current
+                    depth[neighbor] = next_depth
+                    if neighbor == target:
+                        return True
+                    queue[tail] = neighbor
+                    tail += 1
+        return False
+
+    def reached(self, node):
+        return self.stamp[node] == self.generation
+
+    def distance(self, source, target):
+        if self.search(source, target):
+            return self.depth[target]
+        return float('inf')
+
+    def next_hop(self, start, goal):
+        """First step on a shortest path from start to goal (start if unreachable).
+
+        Searches outward from goal so the answer is simply start's parent.
+        """
+        if self.search(goal, start):
+            return self.parent[start]
+        return start
+
+    def parents_array(self):
+        """Parent of every node from the last full search, -1 where unreached."""
+        parents = np.frombuffer(self.parent, dtype=np.dtype(self.parent.typecode)).astype(np.int32)
+        stamps = np.frombuffer(self.stamp, dtype=np.dtype(self.stamp.typecode))
+        parents[stamps != self.generation] = -1
+        return parents
+
@@ -0,0 +1,72 @@
+# csr_graph.py
+from bisect import bisect_left
+import numpy as np
+
+
+class CSRGraph:
+    """Read-only compressed-sparse-row copy of a map for the per-turn hot path.
+
+    Node u's neighbours are targets[offsets[u]:offsets[u+1]], sorted, with the
+    matching edge weights alongside. Everything lives in three NumPy arrays;
+    the memoryviews over them give plain Python ints/floats when indexed,
+    which keeps the pure-Python search loops fast without a second copy.
+    Maps are generated straight into this form with from_edges();
+    from_networkx() is for graphs built with NetworkX, as in the benchmarks.
+    """
+
+    def __init__(self, indptr, indices, weights):
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.node_count = len(self.indptr) - 1
+        self.edge_count = len(self.indices) // 2
+        self.offsets = memoryview(self.indptr)
+        self.targets = memoryview(self.indices)
+        self.costs = memoryview(self.weights)
+
+    @classmethod
+    def from_networkx(cls, G, weight='weight'):
+        """Build from a graph whose nodes are 0..n-1; missing weights count as 1."""
+        n = G.number_of_nodes()
+        adj = G.adj
+        degrees = np.fromiter((len(adj[u]) for u in range(n)), dtype=np.int64, count=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        weights = np.empty(indptr[-1], dtype=np.float32)
+        for u in range(n):
+            row = sorted(adj[u].items())
+            start, end = indptr[u], indptr[u + 1]
+            indices[start:end] = [v for v, _ in row]
+            weights[start:end] = [attrs.get(weight, 1) for _, attrs in row]
+        return cls(indptr, indices, weights)
+
+    @classmethod
+    def from_edges(cls, node_count, u, v, w):
+        """Build from undirected edge arrays (each edge listed once)."""
+        sources = np.concatenate([u, v])
+        targets = np.concatenate([v, u])
+        order = np.argsort(sources.astype(np.int64) * node_count + targets)
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+        return cls(indptr, targets[order], np.concatenate([w, w])[order])
+
+    def edges(self):
+        """Undirected edge arrays (u, v, weight) with u < v."""
+        sources = np.repeat(np.arange(self.node_count, dtype=np.int32), np.diff(self.indptr))
+        keep = sources < self.indices
+        return sources[keep], self.indices[keep], self.weights[keep]
+
+    def neighbors(self, u):
+        return self.indices[self.indptr[u]:self.indptr[u + 1]].tolist()
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def has_edge(self, u, v):
+        start, end = self.offsets[u], self.offsets[u + 1]
+        k = bisect_left(self.targets, v, start, end)
+        return k < end and self.targets[k] == v
+
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
@@ -0,0 +1,136 @@
+# db_pool.py
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PooledConnection:
+    """An open database connection and the prepared cursors made on it."""
+
+    def __init__(self, raw, prepare):
+        self.raw = raw
+        self.prepare = prepare
+        self.cursors = {}
+        self.last_used = time.monotonic()
+
+    def execute(self, sql, params=()):
+        """Run `sql` on this connection's cursor for that statement and return the cursor.
+
+        The cursor is made by prepare(raw) the first time `sql` is seen, so
+        with prepared cursors the statement is parsed by the server once per
+        connection rather than once per call.
+        """
+        cursor = self._cursor(sql)
+        cursor.execute(sql, params)
+        return cursor
+
+    def executemany(self, sql, seq_of_params):
+        """Run `sql` once per parameter tuple on the same cached cursor as execute()."""
+        cursor = self._cursor(sql)
+        cursor.executemany(sql, seq_of_params)
+        return cursor
+
+    def _cursor(self, sql):
+        cursor = self.cursors.get(sql)
+        if cursor is None:
+            cursor = self.cursors[sql] = self.prepare(self.raw)
+        return cursor
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        for cursor in self.cursors.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self.cursors.clear()
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Process-wide pool of open database connections.
+
+    connection() lends an idle connection, or one from connect() when none
+    is idle, and takes it back afterwards; up to `size` idle connections are
+    kept open for reuse and any beyond that are closed. A connection that
+    sat idle for more than `check_after` seconds is checked with ping(raw)
+    before it is lent out and replaced if the ping raises. When the body of
+    the `with` raises, the connection is rolled back, or dropped if even
+    that fails, and the error propagates. Safe to share between threads.
+    """
+
+    def __init__(self, connect, size=4, prepare=None, ping=None, check_after=30.0):
+        self.connect = connect
+        self.size = size
+        self.prepare = prepare or (lambda raw: raw.cursor())
+        self.ping = ping
+        self.check_after = check_after
+        self.lock = threading.Lock()
+        self.idle = []
+        self.closed = False
+        self.opened = 0
+        self.reused = 0
+        self.replaced = 0
+
+    def _acquire(self):
+        while True:
+            with self.lock:
+                conn = self.idle.pop() if self.idle else None
+                if conn is None:
+                    self.opened += 1
+            if conn is None:
+                return PooledConnection(self.connect(), self.prepare)
+            if self.ping is not None and time.monotonic() - conn.last_used > self.check_after:
+                try:
+                    self.ping(conn.raw)
+                except Exception:
+                    conn.close()
+                    with self.lock:
+                        self.replaced += 1
+                    continue
+            with self.lock:
+                self.reused += 1
+            return conn
+
+    def _release(self, conn):
+        conn.last_used = time.monotonic()
+        with self.lock:
+            if not self.closed and len(self.idle) < self.size:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                conn.close()
+            else:
+                self._release(conn)
+            raise
+        self._release(conn)
+
+    def stats(self):
+        with self.lock:
+            return {'idle': len(self.idle), 'opened': self.opened,
+                    'reused': self.reused, 'replaced': self.replaced}
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+            self.closed = True
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,63 @@
+# distance_oracle.py
+import numpy as np
+from bfs_engine import BFSEngine
+
+# Above this many nodes the dense table would not fit comfortably in memory,
+# so distances are answered by an early-exit BFS instead.
+MAX_TABLE_NODES = 10000
+
+
+class DistanceOracle:
+    """All-pairs hop distances for one map, answered from a dense array."""
+
+    def __init__(self, graph, engine=None, table=None):
+        self.node_count = graph.node_count
+        self.engine = engine
+        if table is not None:
+            self.table = table
+            return
+        if self.node_count > MAX_TABLE_NODES:
+            self.table = None
+            if self.engine is None:
+                self.engine = BFSEngine(graph)
+            return
+        dtype = np.int16 if self.node_count < np.iinfo(np.int16).max else np.int32
+        self.table = np.full((self.node_count, self.node_count), -1, dtype=dtype)
+        np.fill_diagonal(self.table, 0)
+        self._fill_table(graph.indptr, graph.indices)
+
+    def _fill_table(self, indptr, indices):
+        """Breadth-first search from every node at once, one bit per source.
+
+        Row v of `visited` holds a bit for each source that has reached v, so a
+        whole BFS level is one OR-reduction of the frontier rows over each
+        node's neighbours.
+        """
+        n = self.node_count
+        if indices.size == 0:
+            return
+        words = (n + 63) // 64
+        visited = np.zeros((n, words * 8), dtype=np.uint8)
+        visited[:, :(n + 7) // 8] = np.packbits(np.eye(n, dtype=bool), axis=1)
+        visited = visited.view(np.uint64)
+        frontier = visited.copy()
+        linked = np.flatnonzero(np.diff(indptr))
+        level = 0
+        while True:
+            level += 1
+            reached = np.zeros_like(visited)
+            reached[linked] = np.bitwise_or.reduceat(frontier[indices], indptr[linked], axis=0)
+            reached &= ~visited
+            if not reached.any():
+                break
+            visited |= reached
+            hits = np.unpackbits(reached.view(np.uint8), axis=1, count=n).view(bool)
+            self.table[hits] = level
+            frontier = reached
+
+    def distance(self, u, v):
+        if self.table is None:
+            return self.engine.distance(u, v)
+        d = self.table[u, v]
+        return float('inf') if d < 0 else int(d)
+
@@ -1,93 +1,149 @@
 # PROJECT PHANTOM PURSUIT
+import argparse
+import atexit
+import importlib
 import random
-import sys
-import os
-import json
-from heapq import heappush, heappop
-import networkx as nx
-import matplotlib.pyplot as plt
-import tkinter as tk
-from PIL import Image, ImageTk
+import threading
 import time
-from collections import deque
-import mysql.connector
-import pygame
-
-pygame.mixer.init()
+import uuid
+from bfs_engine import BFSEngine
+from distance_oracle import DistanceOracle
+from landmarks import LandmarkAStar
+from loading_screen import warm_up
+from map_cache import cached_map
+from map_pool import MapPool
+from routing import NextHopTable
+from sound_bank import SoundBank
+from spatial_index import GridIndex
+from stats_buffer import StatsBuffer
+from stats_service import StatsService
+from stats_store import (MemoryStatsStore, MySQLStatsStore, SQLiteStatsStore, StatsError, apply_delta,
+                         new_stats, stats_delta)
+
+MAP_NODES = 24
+MAP_RADIUS = 0.2
+MAP_SETTINGS = {1: (MAP_NODES, MAP_RADIUS), 2: (MAP_NODES, MAP_RADIUS), 3: (MAP_NODES, MAP_RADIUS)}
+# How long the loading screen waits for the map pool before the game builds its map itself.
+MAP_WAIT_SECONDS = 10.0
+# Renderer classes by name, imported only when chosen so that a run never
+# loads the GUI toolkits it does not use.
+RENDERERS = {
+    'matplotlib': 'matplotlib_renderer.MatplotlibRenderer',
+    'pygame': 'pygame_renderer.PygameRenderer',
+    'text': 'text_renderer.TextRenderer',
+}
+# Clicks farther than this (in layout units) from every node are ignored.
+CLICK_RADIUS = 0.05
+
+sounds = SoundBank()
 
 def play_sound(file):
-    pygame.mixer.Sound(file).play()
-
-
-def connect_to_db():
-    print("db connect")
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  
-        password="root",  
-        port=3306,
-        database="ghost_game"  
-    )
+    sounds.play(file)
+
+
+def load_renderer(name):
+    module, _, cls = RENDERERS[name].rpartition('.')
+    return getattr(importlib.import_module(module), cls)
+
+
+def wait_for_maps(pool):
+    """Warm-up task: wait up to MAP_WAIT_SECONDS for the pool; if it is late or failing, take() builds the map."""
+    try:
+        if not pool.wait(MAP_WAIT_SECONDS):
+            print("Maps are taking long; the first one will be built when the game starts.")
+    except RuntimeError as err:
+        print(f"Could not prepare maps ({err}); they will be built when the game starts.")
+
+
+DB_CONFIG = {
+    'host': "localhost",
+    'user': "root",
+    'password': "root",
+    'port': 3306,
+    'database': "ghost_game",
+}
+# Idle connections kept open by the stats pool.
+DB_POOL_SIZE = 4
+SQLITE_PATH = "ghost_game.db"
+# Stats backends by name; STATS_BACKEND (set by --stats) picks the one used.
+STATS_STORES = {
+    'mysql': lambda: MySQLStatsStore(DB_CONFIG, pool_size=DB_POOL_SIZE),
+    'sqlite': lambda: SQLiteStatsStore(SQLITE_PATH, pool_size=DB_POOL_SIZE),
+    'memory': MemoryStatsStore,
+}
+STATS_BACKEND = 'mysql'
+# Game results are journaled locally and written to the mysql or sqlite
+# backend in batches, every STATS_FLUSH_SECONDS or once STATS_FLUSH_ROWS
+# players have results pending. Each process has its own journal; at
+# start the journals of crashed processes are replayed.
+STATS_WRITE_BEHIND = True
+STATS_JOURNAL = "stats_journal_{backend}_{id}.jsonl"
+STATS_FLUSH_SECONDS = 1.0
+STATS_FLUSH_ROWS = 64
+stats = None
+stats_lock = threading.Lock()
+
+
+def open_stats_store():
+    store = STATS_STORES[STATS_BACKEND]()
+    if STATS_WRITE_BEHIND and STATS_BACKEND != 'memory':
+        store = StatsBuffer(store, STATS_JOURNAL.format(backend=STATS_BACKEND, id=uuid.uuid4().hex),
+                            flush_every=STATS_FLUSH_SECONDS, flush_rows=STATS_FLUSH_ROWS,
+                            orphans=STATS_JOURNAL.format(backend=STATS_BACKEND, id='*'))
+    return store
+
+
+def stats_service():
+    """The process-wide StatsService for STATS_BACKEND, started on first use and closed at exit.
+
+    The store is opened, and all stats I/O done, on the service's thread,
+    so neither the board nor the console waits on the database.
+    """
+    global stats
+    with stats_lock:
+        if stats is None:
+            stats = StatsService(open_stats_store)
+            atexit.register(close_stats_service)
+        return stats
+
+
+def close_stats_service():
+    stats.close()
+    if isinstance(stats.store, StatsBuffer):
+        print(stats.store.report())
 
 def visualize_game_state(game):
-    if not hasattr(game, 'G'):
-        game.G = nx.random_geometric_graph(24, 0.2)
-        edges = list(game.G.edges())
-        game.pos = nx.spring_layout(game.G, k=2, seed=42) 
-
-        for u, v in edges:
-            
-            x1, y1 = game.pos[u]
-            x2, y2 = game.pos[v]
-            distance = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-            game.G[u][v]['weight'] = round(distance, 2)  
-
-        while not nx.is_connected(game.G):
-            largest_cc = max(nx.connected_components(game.G), key=len)
-            for node in game.G.nodes():
-                if node not in largest_cc:
-                    target = random.choice(list(largest_cc))
-                    game.G.add_edge(node, target)
-
-    plt.clf()
-
-    nx.draw_networkx_edges(game.G, game.pos, edge_color='gray', width=1, alpha=0.5)
-    nx.draw_networkx_nodes(game.G, game.pos, node_color='white', 
-                           node_size=500, edgecolors='gray')
-    nx.draw_networkx_nodes(game.G, game.pos, 
-                           nodelist=[game.player_position-1],
-                           node_color='green', node_size=700, 
-                           label='Player', node_shape='o')
-    nx.draw_networkx_nodes(game.G, game.pos, 
-                           nodelist=[game.ghost_position-1],
-                           node_color='red', node_size=700, 
-                           label='Ghost', node_shape='h')
-    
-    labels = {i: str(i+1) for i in game.G.nodes()}
-    nx.draw_networkx_labels(game.G, game.pos, labels)
-
-    if game.difficulty == 3:
-        edge_labels = nx.get_edge_attributes(game.G, 'weight')  
-        nx.draw_networkx_edge_labels(game.G, game.pos, edge_labels=edge_labels, font_size=8, font_color='blue')
-
-    plt.text(0.02, 0.004, f'Sanity: {game.sanity}', 
-             transform=plt.gca().transAxes, verticalalignment='top')
-    plt.text(0.02, 0.057, f'Current Score: {game.current_score}', 
-             transform=plt.gca().transAxes, verticalalignment='top')
+    if not hasattr(game, 'graph'):
+        if game.map is None:
+            game.map = cached_map(MAP_NODES, MAP_RADIUS, seed=game.map_seed)
+        game.pos = game.map.layout()
+        game.node_index = GridIndex(game.map.positions, min(CLICK_RADIUS, game.map.radius))
 
-    difficulty_name = {1: 'Easy', 2: 'Medium', 3: 'Hard'}[game.difficulty]
-    plt.title(f'Ghost Game - {difficulty_name} Mode')
+        game.build_graph_tables(game.map)
 
-    plt.axis('off')
-    plt.pause(0.1)
+    # The static layers are drawn once per game; later turns only update
+    # the tokens and HUD text in place.
+    if game.renderer is None:
+        game.renderer = (game.renderer_factory or load_renderer(game.renderer_name))(game)
+    game.renderer.update(game)
+    game.renderer.present()
 
 class Game:
-    def __init__(self, player_name):
+    def __init__(self, player_name, map_pool=None, renderer_name='matplotlib'):
         self.player_name = player_name
+        self.stats_error = None
         self.load_user_stats()
         self.reset_stats()
         self.difficulty = 1  
         self.history = []  
+        self.map_seed = None
+        self.map_pool = map_pool
+        self.map = None
+        self.renderer_name = renderer_name
+        # Called with the game to build its renderer instead of RENDERERS,
+        # e.g. by the Tk app to put the board inside its own window.
+        self.renderer_factory = None
+        self.renderer = None
         
     def reset_stats(self):
         self.sanity = 0
@@ -95,7 +151,7 @@ class Game:
         self.current_score = 0  
         self.booster_chance = 45
         self.heart_of_dead_chance = 10
-        self.player_position = random.randint(1, 25)
+        self.player_position = random.randint(1, MAP_NODES)
         self.ghost_position = self.get_distant_ghost_position()
         self.ghost_hunt = False
         self.hunt_duration = 0
@@ -103,83 +159,65 @@ class Game:
 
     def get_distant_ghost_position(self):
         while True:
-            pos = random.randint(1, 25)
+            pos = random.randint(1, MAP_NODES)
             if self.manhattan_distance(pos, self.player_position) >= 4:
                 return pos
 
     def manhattan_distance(self, pos1, pos2):
-        if pos1 == 24:
-            pos1 = 23
-        if pos2 == 24:
-            pos2 = 23
-        if hasattr(self, 'G'):
-            try:
-                return nx.shortest_path_length(self.G, pos1-1, pos2-1)
-            except nx.NetworkXNoPath:
-                return float('inf')
+        if hasattr(self, 'graph'):
+            return self.distances.distance(pos1-1, pos2-1)
         return abs((pos1-1) - (pos2-1))  
 
+    def build_graph_tables(self, game_map=None):
+        """Precompute the per-map lookup tables used on every turn.
+
+        self.graph is the CSR graph of `game_map` (default: self.map) that
+        every per-turn query runs against; tables cached with the map are
+        reused rather than rebuilt.
+        """
+        if game_map is None:
+            game_map = self.map
+        self.graph = game_map.graph
+        tables = game_map.tables
+        self.bfs = BFSEngine(self.graph)
+        self.distances = DistanceOracle(self.graph, engine=self.bfs, table=tables.get('distances'))
+        self.routes = {
+            'hops': NextHopTable(self.graph, engine=self.bfs),
+            'weight': NextHopTable(self.graph, weighted=True),
+        }
+        self.astar = LandmarkAStar(self.graph, pos=self.pos, table=tables.get('landmark_distances'))
+
     def get_neighbors(self, position):
-        if hasattr(self, 'G'):
-            return [n+1 for n in self.G.neighbors(position-1)]
+        if hasattr(self, 'graph'):
+            return [n+1 for n in self.graph.neighbors(position-1)]
         return []
 
+    def is_valid_move(self, position):
+        """True if position is adjacent to the player's current node."""
+        if not hasattr(self, 'graph'):
+            return False
+        return self.graph.has_edge(self.player_position-1, position-1)
+
     def bfs_pathfinding(self, start, goal):
-        if start == 24:
-            start = 23
-        if goal == 24:
-            goal = 23
-        if not hasattr(self, 'G'):
+        if not hasattr(self, 'graph'):
             return start
 
-        visited = set()
-        queue = deque([(start-1, [start-1])])
-
-        while queue:
-            current, path = queue.popleft()
-            if current == goal-1:
-                return path[1]+1 if len(path) > 1 else start
-            if current in visited:
-                continue
-            visited.add(current)
-
-            for neighbor in self.G.neighbors(current):
-                if neighbor not in visited:
-                    queue.append((neighbor, path + [neighbor]))
-        return start
+        return self.bfs.next_hop(start-1, goal-1) + 1
 
     def dijkstra_pathfinding(self, start, goal):
-        if start == 24:
-            start = 23
-        if goal == 24:
-            goal = 23
-        if not hasattr(self, 'G'):
+        if not hasattr(self, 'graph'):
             return start
 
-        try:
-            path = nx.dijkstra_path(self.G, start-1, goal-1)
-            return path[1]+1 if len(path) > 1 else start
-        except nx.NetworkXNoPath:
-            return start
+        return self.routes['weight'].next_hop(start-1, goal-1) + 1
 
     def astar_pathfinding(self, start, goal):
-        if start == 24:
-            start = 23
-        if goal == 24:
-            goal = 23
-        if not hasattr(self, 'G'):
+        if not hasattr(self, 'graph'):
             return start
 
-        try:
-            path = nx.astar_path(self.G, start-1, goal-1, weight='weight')
-            # graph is zero indexed , while start and goal might be 1
-            return path[1]+1 if len(path) > 1 else start
-        except nx.NetworkXNoPath:
-            return start
+        # graph is zero indexed , while start and goal might be 1
+        return self.astar.next_hop(start-1, goal-1) + 1
 
     def move_ghost(self):
-        status_text1 = plt.text(0.5, 1.03, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="green")
-        status_text2 = plt.text(0.5, 1.05, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="red")
         """Logic to move the ghost based on difficulty level."""
         if self.ghost_hunt:
             self.hunt_duration -= 1
@@ -188,17 +226,13 @@ class Game:
                 self.ghost_hunt = False
                 self.ghost_move_counter = 0
                 print("The ghost has stopped hunting. You're safe... for now.")
-                status_text1.set_text("The ghost has stopped hunting. You're safe... for now.")
-                plt.draw()  
-                plt.pause(0.1)
+                self.show_message("The ghost has stopped hunting. You're safe... for now.", 'green')
                 
         else:
             if self.ghost_move_counter >= 5:
                 if not self.ghost_hunt:
                     print("The ghost is hunting you! Sanity will decrease by 6 each move.")
-                    status_text2.set_text("The ghost is hunting you!")
-                    plt.draw()  
-                    plt.pause(0.1)
+                    self.show_message("The ghost is hunting you!", 'red')
                     play_sound("Sound/iseeyou.mp3")
                 self.ghost_hunt = True
                 self.hunt_duration = random.randint(2, 5)
@@ -214,74 +248,66 @@ class Game:
                     self.ghost_position = self.select_pathfinding(self.ghost_position, self.player_position)
 
     def select_pathfinding(self, start, goal):
-        """Selects the appropriate pathfinding algorithm based on difficulty."""
-        if self.difficulty == 1:
-            return self.bfs_pathfinding(start, goal)
-        elif self.difficulty == 2:
-            return self.dijkstra_pathfinding(start, goal)
-        elif self.difficulty == 3:
+        """Next ghost step toward goal for the current difficulty.
+
+        Easy and Medium read the routing table (fewest hops / edge weight).
+        Hard runs landmark A* per move: the player is on a new node almost
+        every turn, and on big maps one A* query expands far fewer nodes
+        than filling a whole Dijkstra column for that node.
+        """
+        if self.difficulty == 3:
             return self.astar_pathfinding(start, goal)
-        return start
+        if self.difficulty not in (1, 2):
+            return start
+        if not hasattr(self, 'graph'):
+            return start
 
-    def load_user_stats(self):
-        db = connect_to_db()
+        if getattr(self, 'routes', None) is None:
+            self.build_graph_tables()
+        table = self.routes['hops' if self.difficulty == 1 else 'weight']
+        return table.next_hop(start-1, goal-1) + 1
 
-        cursor = db.cursor(dictionary=True)
-    
+    def load_user_stats(self):
+        """Wait for the player's stats, which main() asks the stats service to prefetch."""
         try:
-            cursor.execute("SELECT * FROM user_stats WHERE player_name = %s", (self.player_name,))
-            result = cursor.fetchone()
-        
-            if result:
-                self.user_stats = result
-            else:
-                self.user_stats = {
-                    "games_played": 0,
-                    "total_score": 0,
-                    "best_score": 0,
-                    "hearts_of_dead": 0
-                }
-                cursor.execute(
-                    "INSERT INTO user_stats (player_name) VALUES (%s)", 
-                    (self.player_name,)
-            )
-                db.commit()
-        except mysql.connector.Error as err:
+            self.user_stats = stats_service().load(self.player_name).result()
+        except StatsError as err:
             print(f"Error loading stats: {err}")
-            self.user_stats = {
-                "games_played": 0,
-                "total_score": 0,
-                "best_score": 0,
-                "hearts_of_dead": 0
-            }
-        finally:
-            cursor.close()
-            db.close()
-
-    def save_user_stats(self):
-        db = connect_to_db()
-        cursor = db.cursor()
-    
-        try:
-            cursor.execute("""
-                UPDATE user_stats
-                SET games_played = %s, total_score = %s, best_score = %s, hearts_of_dead = %s
-                WHERE player_name = %s
-            """, (
-                self.user_stats['games_played'],
-                self.user_stats['total_score'],
-                self.user_stats['best_score'],
-                self.user_stats['hearts_of_dead'],
-                self.player_name
-            ))
-            db.commit()
-        except mysql.connector.Error as err:
+            self.user_stats = new_stats()
+
+    def save_user_stats(self, delta):
+        """Add `delta`, a stats_delta(), to self.user_stats now and to the stored stats in the background.
+
+        A failed save is printed and kept in self.stats_error for the store screen to show.
+        """
+        apply_delta(self.user_stats, delta)
+        stats_service().add(self.player_name, delta).add_done_callback(self._stats_saved)
+
+    def _stats_saved(self, future):
+        err = future.exception()
+        if err is not None:
             print(f"Error saving stats: {err}")
-        finally:
-            cursor.close()
-            db.close()
+            self.stats_error = err
+
+    @property
+    def stats_error(self):
+        """The last failed save, else the write-behind buffer's failing flush to the backend; None if neither.
+
+        Setting it (None once shown) only clears a failed save: a failing
+        flush is reported until the buffer writes again.
+        """
+        if self.save_error is not None:
+            return self.save_error
+        return getattr(stats_service().store, 'last_error', None)
+
+    @stats_error.setter
+    def stats_error(self, err):
+        self.save_error = err
 
     def store(self):
+        if self.stats_error is not None:
+            print(f"Stats were not saved: {self.stats_error}")
+            self.stats_error = None
         print("\nWelcome to the store!")
         print("You can exchange 29 points for 1 Heart of the Dead.")
         print(f"Total Score: {self.user_stats['total_score']}")
@@ -301,12 +327,7 @@ class Game:
 
                 if num_exchanges.isdigit():
                     num_exchanges = int(num_exchanges)
-                    if 1 <= num_exchanges <= possible_exchanges:
-                        self.user_stats['total_score'] -= num_exchanges * 29
-                        self.hearts_of_dead += num_exchanges
-                        self.user_stats['hearts_of_dead'] = self.hearts_of_dead 
-                        self.save_user_stats()
-                        play_sound("Sound/revive.mp3")
+                    if self.buy_hearts(num_exchanges):
                         print(f"You successfully exchanged {num_exchanges * 29} points for {num_exchanges} Hearts of the Dead!")
                         print(f"Remaining Total Score: {self.user_stats['total_score']}")
                         print(f"Current Hearts of the Dead: {self.hearts_of_dead}")
@@ -323,16 +344,25 @@ class Game:
             else:
                 print("Invalid input. Please enter 'y' or 'n'.")
 
+    def buy_hearts(self, count):
+        """Exchange 29 points for each of `count` Hearts of the Dead; False if they cannot be afforded."""
+        if not 1 <= count <= self.user_stats['total_score'] // 29:
+            return False
+        self.hearts_of_dead += count
+        self.save_user_stats(stats_delta(total_score=-count * 29, hearts_of_dead=count))
+        play_sound("Sound/revive.mp3")
+        return True
+
     def update_stats_on_game_over(self):
-        self.user_stats["games_played"] += 1
-        
         if self.current_score > self.user_stats["best_score"]:
-            self.user_stats["best_score"] = self.current_score
             print(f"New Best Score: {self.current_score}!")
-        
-        self.user_stats["total_score"] += self.current_score
-        self.user_stats["hearts_of_dead"] = self.hearts_of_dead
-        self.save_user_stats()
+
+        self.save_user_stats(stats_delta(
+            games_played=1,
+            total_score=self.current_score,
+            best_score=self.current_score,
+            hearts_of_dead=self.hearts_of_dead - self.user_stats["hearts_of_dead"],
+        ))
 
     def display_user_stats(self):
         print(f"\nUser Stats for {self.player_name}:")
@@ -359,21 +389,30 @@ class Game:
             except ValueError:
                 print("Please enter a valid number")
 
-        self.sanity = {1: 100, 2: 70, 3: 50}.get(self.difficulty, 50)
+        self.begin(self.difficulty)
         self.play()
+        self.offer_replay()
+
+    def begin(self, difficulty):
+        """Start a new game: set the difficulty and starting sanity and clear the move history.
+
+        The previous game's map and tables are dropped; the map is taken
+        from the pool if there is one (else made on the first turn, the same
+        one each game if map_seed is set), and the first turn builds its
+        tables.
+        """
+        self.difficulty = difficulty
+        self.history = []
+        self.map = self.map_pool.take(self.difficulty) if self.map_pool is not None else None
+        if hasattr(self, 'graph'):
+            del self.graph
+        self.sanity = {1: 100, 2: 70, 3: 50}.get(self.difficulty, 50)
 
     def handle_ghost_encounter(self):
-        status_text = plt.text(0.5, 1.01, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="red")
         print("The ghost caught you!")
+        self.show_message("You Died!", 'red')
         while self.hearts_of_dead > 0:
-            while True:
-                respawn_choice = input("You have a Heart of the Dead. Do you want to respawn? (y/n): ").strip().lower()
-                status_text.set_text("You Died!")
-                if respawn_choice in ('y', 'n'):
-                    break
-                print("Invalid input. Please enter 'y' or 'n'.")
-
-            if respawn_choice == 'y':
+            if self.renderer.ask("You have a Heart of the Dead. Do you want to respawn?"):
                 play_sound("Sound/breath.mp3")
                 self.hearts_of_dead -= 1
                 respawn_sanity = {
@@ -385,7 +424,7 @@ class Game:
                 print(f"You have been respawned with {self.sanity} sanity points!")
                 print(f"Remaining Hearts of the Dead: {self.hearts_of_dead}")
                 
-                self.player_position = random.randint(1, 25) 
+                self.player_position = random.randint(1, MAP_NODES) 
                 self.ghost_position = self.get_distant_ghost_position()  
                 print(f"Player respawned at position {self.player_position}. Ghost is at {self.ghost_position}.")
 
@@ -393,66 +432,33 @@ class Game:
                 return True
             else:
                 print("You chose not to respawn. Game Over.")
-                status_text.set_text("You Died!")
-                play_sound("sound/end.mp3 ")
-                plt.close()
-                self.update_stats_on_game_over()
-                replay_choice = input("Would you like to view your game history and replay the moves? (y/n): ").strip().lower()
-                if replay_choice == 'y':
-                    self.review_history()
-                else:
-                    exit(0)
-                exit(0)
+                # Ends renderer.run() in play(), which records the game.
+                self.renderer.close()
+                return False
         else:
             print("You have no Hearts of the Dead to respawn. Game Over.")
-            status_text.set_text("You Died!")
-            play_sound("sound/end.mp3 ")
-            plt.close()
-            self.update_stats_on_game_over()
-            replay_choice = input("Would you like to view your game history and replay the moves? (y/n): ").strip().lower()
-            if replay_choice == 'y':
-                self.review_history()
-            else:
-                exit(0)
-            exit(0)
+            self.renderer.close()
+            return False
 
     def collect_powerup(self):
-        status_text = plt.text(0.5, 1.07, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="blue")
         if random.randint(1, 100) <= self.booster_chance:
             print("You found a booster tablet! Your sanity is restored.")
-            status_text.set_text("You found a booster tablet! Your sanity is restored.")
-            plt.draw()  
-            plt.pause(0.1)
+            self.show_message("You found a booster tablet! Your sanity is restored.")
             self.sanity += 20
         elif random.randint(1, 100) <= self.heart_of_dead_chance:
             print("You found a Heart of the Dead!")
-            status_text.set_text("You found a Heart of the Dead!")
-            plt.draw() 
-            plt.pause(0.1)
+            self.show_message("You found a Heart of the Dead!")
             play_sound("Sound/revive.mp3")
             self.hearts_of_dead += 1
 
-    def display_loading_screen(self):
-        root = tk.Tk()
-        root.title("Loading Ghost Game")
-        root.geometry("700x800")
-        
-        image = Image.open("Sound/loading.png")  
-        image = image.resize((700, 800))
-        photo = ImageTk.PhotoImage(image)
-        
-        label = tk.Label(root, image=photo)
-        label.pack()
-        
-        def close_loading_screen():
-            root.destroy()
-        
-        root.after(3000, close_loading_screen)
-        root.mainloop()
-
+    def show_message(self, message, color='blue'):
+        """Queue a status line; it appears with the next frame."""
+        if self.renderer is not None:
+            self.renderer.messages.post(message, color)
 
     def record_history(self):
-        self.history.append({"player": self.player_position,"ghost": self.ghost_position})
+        self.history.append({"player": self.player_position, "ghost": self.ghost_position,
+                             "sanity": self.sanity, "score": self.current_score})
 
     def review_history(self):
         player_moves = [move["player"] for move in self.history]
@@ -464,39 +470,37 @@ class Game:
         print("Review completed.")
 
     def play(self):
-        plt.figure(figsize=(10, 10))
+        """Play one game on the board; a game not begun (sanity 0) is neither shown nor recorded."""
+        if self.sanity <= 0:
+            return
+        self.renderer = None
+        if self.renderer_name == 'matplotlib' and self.renderer_factory is None:
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(10, 10))
         visualize_game_state(self)  
-        status_text = plt.text(0.5, 1.03, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="blue")
-        status_text1 = plt.text(0.5, 1.03, "", transform=plt.gca().transAxes, ha="center", fontsize=12, color="red")
 
-        def on_mouse_click(event):
-            nonlocal status_text
+        latencies = []
+
+        # The whole turn runs inside this click handler; between clicks the
+        # renderer's event loop sleeps instead of polling.
+        def on_click(x, y):
             if self.sanity <= 0:
-                print("Game Over!")
-                status_text1.set_text("You Died!")
-                play_sound("sound/end.mp3 ")
-                plt.close()
-                self.update_stats_on_game_over()
-
-                replay_choice = input("Would you like to view your game history and replay the moves? (y/n): ").strip().lower()
-                if replay_choice == 'y':
-                    self.review_history()
-                    exit(0)
+                return
+            clicked = time.perf_counter()
 
-            x, y = event.xdata, event.ydata
             if x is None or y is None:
-                status_text.set_text("Click inside the plot area!")
-                plt.draw()  
-                plt.pause(0.1)
+                self.show_message("Click inside the plot area!")
+                self.renderer.present()
                 return
             
-            distances = {node: ((pos[0] - x) ** 2 + (pos[1] - y) ** 2) for node, pos in self.pos.items()}
-            closest_node = min(distances, key=distances.get) + 1  
-
-            available_moves = self.get_neighbors(self.player_position)
+            closest_node = self.node_index.nearest((x, y), max_distance=CLICK_RADIUS) + 1
+            if closest_node == 0:
+                self.show_message("Click on a node!")
+                self.renderer.present()
+                return
 
-            if closest_node in available_moves:
-               
+            if self.is_valid_move(closest_node):
+                self.renderer.messages.next_turn()
                 self.player_position = closest_node
                 self.collect_powerup()
                 self.move_ghost()
@@ -516,40 +520,64 @@ class Game:
                     if not self.handle_ghost_encounter():
                         return 
 
-                plt.cla()
-                visualize_game_state(self)
-                status_text.set_text(
+                self.show_message(
                     f"Position: {self.player_position}, Score: {self.current_score}, "
                     f"Ghost: {self.ghost_position}, Sanity: {self.sanity}"
                 )
-                plt.draw()
+                if self.sanity <= 0:
+                    self.show_message("You Died!", 'red')
+                visualize_game_state(self)
+                latencies.append(time.perf_counter() - clicked)
+
+                if self.sanity <= 0:
+                    # Game over is an event too: leave "You Died!" up briefly,
+                    # then close the view, which ends renderer.run() below.
+                    self.renderer.close(delay_ms=1500)
             else:
                
-                status_text.set_text("Invalid move! Click on a valid adjacent node.")
-                plt.draw() 
-                plt.pause(0.1)
-
-        plt.gcf().canvas.mpl_connect('button_press_event', on_mouse_click)
+                self.show_message("Invalid move! Click on a valid adjacent node.")
+                self.renderer.present()
 
-        while self.sanity > 0:
-            plt.pause(0.1)  
+        self.renderer.run(on_click)
 
         print("Game Over!")
-        status_text1.set_text("You Died!")
         play_sound("sound/end.mp3 ")
-        plt.close()
         self.update_stats_on_game_over()
+        if latencies:
+            print(f"Click-to-frame latency: mean {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+                  f"worst {max(latencies) * 1000:.1f} ms over {len(latencies)} moves")
 
+    def offer_replay(self):
         replay_choice = input("Would you like to view your game history and replay the moves? (y/n): ").strip().lower()
         if replay_choice == 'y':
             self.review_history()
             exit(0)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project Phantom Pursuit")
+    parser.add_argument('--renderer', choices=sorted(RENDERERS), default='matplotlib',
+                        help="how the map is drawn (default: matplotlib)")
+    parser.add_argument('--mute', action='store_true', help="play no sound (also used when there is no audio device)")
+    parser.add_argument('--headless', action='store_true',
+                        help="play in the terminal without sound; no GUI or audio module is imported")
+    parser.add_argument('--stats', choices=sorted(STATS_STORES), default=STATS_BACKEND,
+                        help=f"where player stats are kept (default: {STATS_BACKEND})")
+    args = parser.parse_args()
+    STATS_BACKEND = args.stats
+    if args.headless:
+        args.renderer = 'text'
+        args.mute = True
+
+    sounds.silent = args.mute
+
+    map_pool = MapPool(MAP_SETTINGS, depth=1)
+    atexit.register(map_pool.close)
     while True:
         player_name = input("Enter your name: ").strip()
         if player_name:
             print(f"User name is set to: {player_name}")
+            # Loaded while the remaining prompts and the splash are up.
+            stats_service().prefetch(player_name)
             break
         else:
             print("Name cannot be empty. Please enter a valid name.")
@@ -565,8 +593,20 @@ if __name__ == "__main__":
             
             if mode == "1":
                 print("\nYou chose Player vs AI. Good luck against the computer!")
-                game = Game(player_name)  
-                game.display_loading_screen()
+                # Everything the first turn needs is loaded in parallel while
+                # the loading screen is up; it closes when the last task ends.
+                tasks = [
+                    ("Loading player stats", lambda: Game(player_name, map_pool=map_pool, renderer_name=args.renderer)),
+                    ("Preparing maps", lambda: wait_for_maps(map_pool)),
+                    ("Loading sounds", sounds.preload),
+                    ("Loading the renderer", lambda: load_renderer(args.renderer)),
+                ]
+                if args.renderer == 'matplotlib':
+                    # Splash, store, board and replay share one Tk window.
+                    from gui_app import GameApp
+                    GameApp().run(tasks)
+                    exit(0)
+                game, _, _, _ = warm_up(tasks, splash=not args.headless)
                 game.start_game()
                 break
             elif mode == "2":
@@ -576,10 +616,6 @@ if __name__ == "__main__":
                 break"""
             else:
                 print("Invalid choice. Please enter 1 for Player vs AI or 2 for Player vs Player.")
-        
-        game.display_user_stats()  
-        game.reset_stats() 
-        game.play()  
 
     else:
         print("Come back when you're ready to face the challenge!")
@@ -0,0 +1,212 @@
+# gui_app.py
+import tkinter as tk
+import types
+from concurrent.futures import ThreadPoolExecutor
+from loading_screen import SplashView
+from renderer import DIFFICULTY_NAMES
+
+# Delay between moves when a game is played back.
+REPLAY_STEP_MS = 500
+
+
+class GameApp:
+    """The GUI game in a single Tk window.
+
+    Splash, store and board are frames of one root, and show() packs the
+    one wanted in place of the current one, so moving between screens
+    creates no window and no second event loop. The board is a TkRenderer
+    on a FigureCanvasTkAgg; after a game it also plays the history back
+    (the replay) on the same renderer. Questions the game asks mid-turn
+    are answered with buttons under the board, in a nested wait() on this
+    root.
+    """
+
+    def __init__(self, title="Ghost Game"):
+        self.root = tk.Tk()
+        self.root.title(title)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+        self.views = {name: tk.Frame(self.root) for name in ('splash', 'store', 'board')}
+        self.current = None
+        self.game = None
+        self.renderer = None
+        self.error = None
+        self.waiting = []
+        self.quitting = False
+        self.replay_step = None
+        self._build_store()
+        self._build_board()
+
+    def _build_store(self):
+        store = self.views['store']
+        self.stats_text = tk.Label(store, justify='left', font=("Arial", 14))
+        self.stats_text.pack(padx=40, pady=20)
+        exchange = tk.Frame(store)
+        exchange.pack(pady=10)
+        tk.Label(exchange, text="Exchange 29 points for each Heart of the Dead:").pack(side='left')
+        self.heart_count = tk.Spinbox(exchange, from_=1, to=1, width=4)
+        self.heart_count.pack(side='left', padx=5)
+        self.buy_button = tk.Button(exchange, text="Buy", command=self.buy)
+        self.buy_button.pack(side='left')
+        self.store_message = tk.Label(store)
+        self.store_message.pack()
+        levels = tk.Frame(store)
+        levels.pack(pady=20)
+        for difficulty, name in DIFFICULTY_NAMES.items():
+            tk.Button(levels, text=f"Play {name}", width=12,
+                      command=lambda d=difficulty: self.start(d)).pack(side='left', padx=5)
+        tk.Button(store, text="Quit", command=self.quit).pack(pady=10)
+
+    def _build_board(self):
+        self.board = tk.Frame(self.views['board'])
+        self.board.pack(fill='both', expand=True)
+        bar = tk.Frame(self.views['board'])
+        bar.pack(fill='x')
+        self.prompt = tk.Label(bar, font=("Arial", 12))
+        self.prompt.pack(side='left', padx=10, pady=5)
+        self.buttons = tk.Frame(bar)
+        self.buttons.pack(side='right', padx=10)
+
+    def show(self, name):
+        if self.current is not None:
+            self.views[self.current].pack_forget()
+        self.views[name].pack(fill='both', expand=True)
+        self.current = name
+
+    def set_bar(self, text, buttons=()):
+        """Show `text` and (label, command) buttons under the board."""
+        self.prompt['text'] = text
+        for child in self.buttons.winfo_children():
+            child.destroy()
+        for label, command in buttons:
+            tk.Button(self.buttons, text=label, width=8, command=command).pack(side='left', padx=3)
+
+    def wait(self, variable, on_quit):
+        """Handle events until `variable` is set; quit() sets it to `on_quit`."""
+        self.waiting.append((variable, on_quit))
+        try:
+            self.root.wait_variable(variable)
+        finally:
+            self.waiting.remove((variable, on_quit))
+
+    def ask(self, question):
+        answer = tk.StringVar(self.root)
+        self.set_bar(question, [("Yes", lambda: answer.set('y')), ("No", lambda: answer.set('n'))])
+        self.wait(answer, 'n')
+        self.set_bar("")
+        return answer.get() == 'y'
+
+    def run(self, tasks):
+        """Warm up behind the splash, then open the store; returns when the window closes.
+
+        `tasks` are (label, callable) pairs run on worker threads as by
+        warm_up(); the first must return the Game. An exception from any
+        of them closes the window and is re-raised here.
+        """
+        executor = ThreadPoolExecutor(max_workers=len(tasks))
+        futures = {executor.submit(task): label for label, task in tasks}
+        executor.shutdown(wait=False)
+        self.show('splash')
+        SplashView(self.views['splash'], futures, lambda: self._ready(list(futures)))
+        self.root.mainloop()
+        if self.error is not None:
+            raise self.error
+
+    def _ready(self, futures):
+        try:
+            results = [future.result() for future in futures]
+        except Exception as err:
+            self.error = err
+            self.root.destroy()
+            return
+        self.game = results[0]
+        self.game.renderer_factory = self._new_renderer
+        self.show_store()
+
+    def _new_renderer(self, game):
+        from tk_renderer import TkRenderer
+        if self.renderer is not None:
+            self.renderer.destroy()
+        self.renderer = TkRenderer(game, self)
+        return self.renderer
+
+    def show_store(self, message=""):
+        self._stop_replay()
+        if self.game.stats_error is not None:
+            message = f"{message}\nStats were not saved: {self.game.stats_error}".strip()
+            self.game.stats_error = None
+        stats = self.game.user_stats
+        self.stats_text['text'] = "\n".join([
+            f"User Stats for {self.game.player_name}:",
+            f"Games Played: {stats['games_played']}",
+            f"Total Score: {stats['total_score']}",
+            f"Best Score: {stats['best_score']}",
+            f"Hearts of the Dead: {self.game.hearts_of_dead}",
+        ])
+        affordable = stats['total_score'] // 29
+        self.heart_count.config(to=max(affordable, 1))
+        self.buy_button.config(state='normal' if affordable else 'disabled')
+        self.store_message['text'] = message
+        self.show('store')
+
+    def buy(self):
+        count = self.heart_count.get().strip()
+        if count.isdigit() and self.game.buy_hearts(int(count)):
+            self.show_store(f"You exchanged {int(count) * 29} points for {count} Hearts of the Dead!")
+        else:
+            self.show_store("Invalid number of exchanges. Please enter a valid amount.")
+
+    def start(self, difficulty):
+        game = self.game
+        game.reset_stats()
+        game.begin(difficulty)
+        self.set_bar("")
+        self.show('board')
+        game.play()
+        if self.quitting:
+            self.root.destroy()
+            return
+        game.renderer.update(game)
+        game.renderer.present()
+        self._game_over(f"Game Over! Score: {game.current_score}")
+
+    def _game_over(self, text):
+        self.set_bar(text, [("Replay", self.replay), ("Store", self.show_store), ("Quit", self.quit)])
+
+    def replay(self):
+        """Play the game history back on the board, one move every REPLAY_STEP_MS."""
+        game, renderer = self.game, self.game.renderer
+        history = list(game.history)
+
+        def step(i):
+            if i == len(history):
+                self.replay_step = None
+                self._game_over("Replay finished.")
+                return
+            move = history[i]
+            state = types.SimpleNamespace(pos=game.pos, player_position=move['player'],
+                                          ghost_position=move['ghost'], sanity=move['sanity'],
+                                          current_score=move['score'])
+            renderer.messages.next_turn()
+            renderer.messages.post(f"Replay: move {i + 1} of {len(history)}")
+            renderer.update(state)
+            renderer.present()
+            self.replay_step = self.root.after(REPLAY_STEP_MS, step, i + 1)
+
+        self._stop_replay()
+        self.set_bar("Replaying...", [("Store", self.show_store), ("Quit", self.quit)])
+        step(0)
+
+    def _stop_replay(self):
+        if self.replay_step is not None:
+            self.root.after_cancel(self.replay_step)
+            self.replay_step = None
+
+    def quit(self):
+        """Close the window; a game in progress is ended, and recorded, first."""
+        self.quitting = True
+        self._stop_replay()
+        if not self.waiting:
+            self.root.destroy()
+            return
+        for variable, value in list(self.waiting):
+            variable.set(value)
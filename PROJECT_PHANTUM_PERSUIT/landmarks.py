@@ -0,0 +1,152 @@
+# landmarks.py
+import math
+from heapq import heappush, heappop
+import numpy as np
+
+LANDMARK_COUNT = 8
+
+
+def choose_landmarks(graph, count=LANDMARK_COUNT):
+    """Landmarks for `graph` and the weighted distance from each to every node.
+
+    Landmarks are spread out by farthest-point selection. Returns an int32
+    array of landmark nodes and a float32 (node_count, landmarks) array of
+    distances, node-major so one node's row is a single read; map builders
+    store them in GameMap.tables as 'landmarks' and 'landmark_distances'.
+    """
+    count = min(count, graph.node_count)
+    landmarks = np.empty(count, dtype=np.int32)
+    table = np.empty((graph.node_count, count), dtype=np.float32)
+    nearest = _distances_from(graph, 0)
+    for k in range(count):
+        reachable = np.where(np.isfinite(nearest), nearest, -1.0)
+        landmarks[k] = reachable.argmax()
+        table[:, k] = _distances_from(graph, int(landmarks[k]))
+        nearest = np.minimum(nearest, table[:, k]) if k else table[:, k].astype(np.float64)
+    return landmarks, table
+
+
+def _distances_from(graph, source):
+    indptr, indices, weights = graph.offsets, graph.targets, graph.costs
+    dist = [float('inf')] * graph.node_count
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, current = heappop(heap)
+        if d > dist[current]:
+            continue
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            nd = d + weights[k]
+            if nd < dist[neighbor]:
+                dist[neighbor] = nd
+                heappush(heap, (nd, neighbor))
+    return np.array(dist)
+
+
+class LandmarkAStar:
+    """A* over CSRGraph edge weights with an ALT (landmark) heuristic.
+
+    `table` is the landmark distance array from choose_landmarks(), made
+    when the map was built; without one, `landmark_count` landmarks are
+    chosen here. By the triangle inequality |d(L, goal) - d(L, v)| never
+    overestimates d(v, goal), so the largest of these over all landmarks
+    is an admissible heuristic. It is worked out for a node only when the
+    search first reaches it, so a query costs nothing per unvisited node.
+
+    When layout positions are given, the straight-line distance is used as
+    well (alone if there are no landmarks). Generated maps weight every
+    edge, bridges included, by its length, but the weights are stored as
+    float32 and a graph may come with weights of its own; so the distance
+    is scaled by the smallest weight-to-length ratio over all edges, which
+    keeps it from overestimating either way.
+    """
+
+    def __init__(self, graph, pos=None, landmark_count=LANDMARK_COUNT, table=None):
+        self.graph = graph
+        self.node_count = graph.node_count
+        self.pos = None
+        self.euclid_scale = 0.0
+        if pos is not None:
+            self.pos = np.array([pos[v] for v in range(self.node_count)], dtype=np.float64)
+            self.euclid_scale = self._euclid_scale()
+        if table is None and landmark_count:
+            _, table = choose_landmarks(graph, landmark_count)
+        self.table = table
+        self.last_expansions = 0
+        self.total_expansions = 0
+        self.queries = 0
+
+    def _euclid_scale(self):
+        graph = self.graph
+        sources = np.repeat(np.arange(self.node_count), np.diff(graph.indptr))
+        length = np.hypot(*(self.pos[sources] - self.pos[graph.indices]).T)
+        ratios = graph.weights[length > 0] / length[length > 0]
+        return float(np.clip(ratios.min(initial=1.0), 0.0, 1.0))
+
+    def bound_to(self, goal):
+        """Function giving a lower bound on the distance from a node to goal."""
+        table, pos, scale = self.table, self.pos, self.euclid_scale
+        goal_row = table[goal].tolist() if table is not None else ()
+        if scale > 0:
+            gx, gy = pos[goal].tolist()
+
+        def bound(node):
+            h = 0.0
+            if goal_row:
+                for a, b in zip(table[node].tolist(), goal_row):
+                    gap = abs(a - b)
+                    # Unreachable landmarks give inf or nan; neither bounds anything.
+                    if h < gap < math.inf:
+                        h = gap
+            if scale > 0:
+                x, y = pos[node].tolist()
+                h = max(h, scale * math.hypot(x - gx, y - gy))
+            return h
+
+        return bound
+
+    def path(self, start, goal):
+        """Cheapest path from start to goal as a node list, or None if unreachable."""
+        indptr, indices, weights = self.graph.offsets, self.graph.targets, self.graph.costs
+        bound = self.bound_to(goal)
+        h = {start: bound(start)}
+        best = {start: 0.0}
+        parent = {start: start}
+        heap = [(h[start], 0.0, start)]
+        closed = set()
+        expansions = 0
+        found = False
+        while heap:
+            _, g, current = heappop(heap)
+            if current in closed:
+                continue
+            if current == goal:
+                found = True
+                break
+            closed.add(current)
+            expansions += 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                ng = g + weights[k]
+                if ng < best.get(neighbor, float('inf')):
+                    best[neighbor] = ng
+                    parent[neighbor] = current
+                    hn = h.get(neighbor)
+                    if hn is None:
+                        hn = h[neighbor] = bound(neighbor)
+                    heappush(heap, (ng + hn, ng, neighbor))
+        self.last_expansions = expansions
+        self.total_expansions += expansions
+        self.queries += 1
+        if not found:
+            return None
+        path = [goal]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def next_hop(self, start, goal):
+        path = self.path(start, goal)
+        return path[1] if path and len(path) > 1 else start
@@ -0,0 +1,94 @@
+# loading_screen.py
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SPLASH_IMAGE = "Sound/loading.png"
+SPLASH_SIZE = (700, 800)
+# How often the splash window checks on the warm-up tasks.
+POLL_MS = 50
+
+
+def splash_path(source=SPLASH_IMAGE, size=SPLASH_SIZE):
+    """Path of `source` resized to `size`, cached next to it as a PNG.
+
+    PIL is imported, and the image resized, only when the cached copy is
+    missing or older than the source; Tk reads the cached PNG directly.
+    """
+    root, _ = os.path.splitext(source)
+    path = f"{root}_{size[0]}x{size[1]}.png"
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        return path
+    from PIL import Image
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            Image.open(source).resize(size).save(file, format="PNG", compress_level=1)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return path
+
+
+def warm_up(tasks, splash=True):
+    """Run `tasks`, a list of (label, callable), on worker threads; return their results in order.
+
+    With `splash`, a Tk window shows the splash image and a progress bar
+    naming the tasks still running, and closes as soon as the last task
+    finishes. Without it, progress is printed instead and tkinter is never
+    imported. An exception from a task is re-raised here.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {executor.submit(task): label for label, task in tasks}
+        if splash:
+            _show_splash(futures)
+        else:
+            for future in as_completed(futures):
+                print(f"{futures[future]}... done ({time.perf_counter() - start:.2f} s)")
+        results = [future.result() for future in futures]
+    print(f"Ready in {time.perf_counter() - start:.2f} s")
+    return results
+
+
+class SplashView:
+    """Splash image and a progress bar following warm-up futures, inside `parent`.
+
+    The bar names the tasks still running; on_done() is called from the Tk
+    event loop once every future has finished.
+    """
+
+    def __init__(self, parent, futures, on_done):
+        import tkinter as tk
+        from tkinter import ttk
+
+        self.parent = parent
+        self.futures = futures
+        self.on_done = on_done
+        self.photo = tk.PhotoImage(master=parent, file=splash_path())
+        tk.Label(parent, image=self.photo).pack()
+        self.progress = ttk.Progressbar(parent, maximum=len(futures), length=SPLASH_SIZE[0])
+        self.progress.pack()
+        self.status = tk.Label(parent)
+        self.status.pack()
+        self.poll()
+
+    def poll(self):
+        running = [label for future, label in self.futures.items() if not future.done()]
+        if not running:
+            self.on_done()
+            return
+        self.progress['value'] = len(self.futures) - len(running)
+        self.status['text'] = ", ".join(running) + "..."
+        self.parent.after(POLL_MS, self.poll)
+
+
+def _show_splash(futures):
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.title("Loading Ghost Game")
+    SplashView(root, futures, root.destroy)
+    root.mainloop()
@@ -0,0 +1,130 @@
+# map_cache.py
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from csr_graph import CSRGraph
+from distance_oracle import DistanceOracle, MAX_TABLE_NODES
+from landmarks import choose_landmarks
+from map_generator import GENERATOR_VERSION, GameMap, generate_map
+
+MAP_CACHE_DIR = "maps"
+
+# File layout: MAGIC, a little-endian u32 header length, a JSON header, then
+# each array's raw bytes starting on an ALIGN-byte boundary.
+MAGIC = b"PHMAP\x00\x01\x00"
+ALIGN = 64
+
+
+def map_path(node_count, radius, seed, cache_dir=MAP_CACHE_DIR):
+    return os.path.join(cache_dir, f"map_n{node_count}_r{radius:g}_s{seed}_v{GENERATOR_VERSION}.phmap")
+
+
+def save_map(game_map, path, tables=None):
+    """Write positions, CSR arrays and any extra named tables to one file.
+
+    Written to a temporary file and renamed into place, so sessions reading
+    the same map never see a half-written file.
+    """
+    arrays = {
+        'positions': game_map.positions,
+        'indptr': game_map.graph.indptr,
+        'indices': game_map.graph.indices,
+        'weights': game_map.graph.weights,
+    }
+    arrays.update(tables or game_map.tables)
+    header = {
+        'node_count': game_map.node_count,
+        'radius': game_map.radius,
+        'seed': game_map.seed,
+        'version': GENERATOR_VERSION,
+        'arrays': {},
+    }
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    encoded = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 4 + len(encoded)) // ALIGN) * ALIGN
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for name, array in arrays.items():
+                file.seek(data_start + header['arrays'][name]['offset'])
+                file.write(array.tobytes())
+            file.truncate(data_start + offset)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_map(path):
+    """Memory-map a saved map; arrays are read-only views onto the file.
+
+    Raises ValueError if the file is not a map written by this
+    GENERATOR_VERSION.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a map file")
+        (length,) = struct.unpack("<I", file.read(4))
+        header = json.loads(file.read(length))
+    if header.get('version') != GENERATOR_VERSION:
+        raise ValueError(f"{path} was written by map generator version {header.get('version')}, "
+                         f"not {GENERATOR_VERSION}")
+    data_start = -(-(len(MAGIC) + 4 + length) // ALIGN) * ALIGN
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=spec['dtype'])
+        else:
+            arrays[name] = np.memmap(path, dtype=spec['dtype'], mode='r',
+                                     offset=data_start + spec['offset'], shape=shape)
+    graph = CSRGraph(arrays.pop('indptr'), arrays.pop('indices'), arrays.pop('weights'))
+    game_map = GameMap(arrays.pop('positions'), graph,
+                       header['node_count'], header['radius'], header['seed'])
+    game_map.tables = arrays
+    return game_map
+
+
+def build_tables(game_map, engine=None):
+    """Add the per-map lookup tables to game_map.tables when the map is built.
+
+    These are the A* landmarks and their distance table, and the hop-distance
+    table when the map is small enough to have one.
+    """
+    game_map.tables['landmarks'], game_map.tables['landmark_distances'] = choose_landmarks(game_map.graph)
+    if game_map.node_count <= MAX_TABLE_NODES:
+        game_map.tables['distances'] = DistanceOracle(game_map.graph, engine=engine).table
+
+
+def cached_map(node_count, radius, seed=None, cache_dir=MAP_CACHE_DIR):
+    """Load the map for these parameters from the cache, generating it on a miss.
+
+    A freshly generated map is saved together with its build_tables(); a
+    file from another GENERATOR_VERSION counts as a miss and is replaced.
+    Maps without a seed are one-off and are never cached.
+    """
+    if seed is None:
+        game_map = generate_map(node_count, radius)
+        build_tables(game_map)
+        return game_map
+    path = map_path(node_count, radius, seed, cache_dir)
+    if os.path.exists(path):
+        try:
+            return load_map(path)
+        except ValueError:
+            pass
+    game_map = generate_map(node_count, radius, seed)
+    build_tables(game_map)
+    save_map(game_map, path)
+    return load_map(path)
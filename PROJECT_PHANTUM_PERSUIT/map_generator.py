@@ -0,0 +1,121 @@
+# map_generator.py
+import numpy as np
+from csr_graph import CSRGraph
+from spatial_index import GridIndex
+
+# Bumped whenever generate_map() or build_tables() would produce a different
+# map or table for the same parameters, so cached maps from before are rebuilt.
+GENERATOR_VERSION = 2
+
+
+class GameMap:
+    """One generated map: node coordinates (also the layout) and the weighted graph.
+
+    `tables` holds any precomputed per-map arrays (hop distances, A*
+    landmarks) by name, as stored in the map cache.
+    """
+
+    def __init__(self, positions, graph, node_count, radius, seed):
+        self.positions = positions
+        self.graph = graph
+        self.node_count = node_count
+        self.radius = radius
+        self.seed = seed
+        self.tables = {}
+
+    def layout(self):
+        """Node -> (x, y) mapping in the form networkx drawing expects."""
+        return dict(enumerate(self.positions))
+
+    def to_networkx(self):
+        """networkx copy of the map; weights match self.graph."""
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(range(self.node_count))
+        u, v, w = self.graph.edges()
+        G.add_weighted_edges_from(zip(u.tolist(), v.tolist(), w.tolist()))
+        return G
+
+
+class UnionFind:
+    """Disjoint sets over nodes 0..n-1, unioned a whole edge list at a time.
+
+    union_edges() hooks the larger root of every still-split edge onto the
+    smaller one and then compresses paths by pointer jumping, repeating until
+    every edge joins a single set. Each round is a handful of NumPy passes
+    and only a few rounds are needed, so labelling stays near-linear.
+    """
+
+    def __init__(self, node_count):
+        self.parent = np.arange(node_count, dtype=np.int64)
+
+    def roots(self):
+        parent = self.parent
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                return parent
+            parent[:] = grand
+
+    def union_edges(self, u, v):
+        while True:
+            roots = self.roots()
+            ru, rv = roots[u], roots[v]
+            split = ru != rv
+            if not split.any():
+                return
+            ru, rv = ru[split], rv[split]
+            np.minimum.at(self.parent, np.maximum(ru, rv), np.minimum(ru, rv))
+
+
+def connect_components(positions, u, v, index):
+    """Extra edges that make the geometric graph (u, v) connected.
+
+    Components are labelled with union-find. Then, Boruvka style, every
+    component outside the largest one is joined by its shortest edge to a
+    node of a different component, found with the spatial index, until one
+    component remains. Bridges are therefore short and local rather than
+    random long jumps across the map.
+    """
+    sets = UnionFind(len(positions))
+    sets.union_edges(u, v)
+    bridge_u, bridge_v = [], []
+    while True:
+        labels = sets.roots()
+        sizes = np.bincount(labels, minlength=len(positions))
+        if np.count_nonzero(sizes) <= 1:
+            break
+        largest = sizes.argmax()
+        best = {}
+        for node in np.flatnonzero(labels != largest).tolist():
+            other = index.nearest(positions[node], labels=labels, exclude=labels[node])
+            length = np.hypot(*(positions[node] - positions[other]))
+            label = labels[node]
+            if label not in best or length < best[label][0]:
+                best[label] = (length, node, other)
+        # Two components can pick the same bridge from either end; add it once.
+        joined = sorted({(min(node, other), max(node, other)) for _, node, other in best.values()})
+        bridge_u.extend(node for node, _ in joined)
+        bridge_v.extend(other for _, other in joined)
+        sets.union_edges(*np.array(joined, dtype=np.int64).T)
+    return np.array(bridge_u, dtype=np.int64), np.array(bridge_v, dtype=np.int64)
+
+
+def generate_map(node_count=24, radius=0.2, seed=None):
+    """Random geometric map on the unit square.
+
+    Nodes closer than `radius` are joined. Neighbours are found with a grid
+    spatial hash instead of checking every pair, edge weights (the Euclidean
+    edge lengths) are computed in one vectorised pass, and the random
+    coordinates double as the drawing layout, so no force-directed layout
+    has to run. The map is made connected with connect_components().
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.random((node_count, 2))
+    index = GridIndex(positions, radius)
+    u, v = index.pairs_within(radius)
+    bridge_u, bridge_v = connect_components(positions, u, v, index)
+    u, v = np.concatenate([u, bridge_u]), np.concatenate([v, bridge_v])
+    weights = np.hypot(*(positions[u] - positions[v]).T)
+    graph = CSRGraph.from_edges(node_count, u, v, weights)
+    return GameMap(positions, graph, node_count, radius, seed)
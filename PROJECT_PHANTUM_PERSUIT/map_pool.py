@@ -0,0 +1,175 @@
+# map_pool.py
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from bfs_engine import BFSEngine
+from map_cache import build_tables, cached_map, load_map, map_path, save_map
+from map_generator import generate_map
+
+
+def build_pool_map(node_count, radius, seed, directory):
+    """Worker task: generate, validate and save one map into `directory`; returns (path, seconds)."""
+    start = time.perf_counter()
+    game_map = generate_map(node_count, radius, seed)
+    engine = BFSEngine(game_map.graph)
+    engine.search(0)
+    if not all(engine.reached(node) for node in range(node_count)):
+        raise RuntimeError(f"generated map n={node_count} seed={seed} is not connected")
+    build_tables(game_map, engine=engine)
+    path = map_path(node_count, radius, seed, directory)
+    save_map(game_map, path)
+    return path, time.perf_counter() - start
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except OSError:  # e.g. still mapped on Windows; close() removes the directory
+        pass
+
+
+class MapPool:
+    """Keeps `depth` ready-made maps per difficulty, built by worker processes.
+
+    Maps are generated, checked for connectivity and written in the
+    background to a private temporary directory, not the shared map cache:
+    pool maps are one-off. take() memory-maps the next finished file and
+    unlinks it at once (the mapping keeps the data alive), and every take()
+    schedules a replacement, so the pool refills itself.
+
+    A failed build is retried after `retry_delay` seconds, doubling with
+    each failure in a row; after `max_failures` in a row the difficulty is
+    given up, wait() raises with the last error, and take() builds that
+    difficulty's maps on the spot.
+    """
+
+    def __init__(self, settings, depth=2, workers=None, max_failures=5, retry_delay=0.5):
+        self.settings = settings
+        self.depth = depth
+        self.max_failures = max_failures
+        self.retry_delay = retry_delay
+        self.directory = tempfile.mkdtemp(prefix="phantom_maps_")
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.ready_changed = threading.Condition(self.lock)
+        self.ready = {difficulty: deque() for difficulty in settings}
+        self.pending = {difficulty: 0 for difficulty in settings}
+        self.failed_in_row = {difficulty: 0 for difficulty in settings}
+        self.last_error = {difficulty: None for difficulty in settings}
+        self.generated = 0
+        self.build_seconds = 0.0
+        self.failures = 0
+        self.started = time.perf_counter()
+        self.closed = False
+        for difficulty in settings:
+            self._refill(difficulty)
+
+    def _given_up(self, difficulty):
+        return self.failed_in_row[difficulty] >= self.max_failures
+
+    def _refill(self, difficulty):
+        node_count, radius = self.settings[difficulty]
+        with self.lock:
+            if self.closed or self._given_up(difficulty):
+                return
+            missing = self.depth - len(self.ready[difficulty]) - self.pending[difficulty]
+            self.pending[difficulty] += max(missing, 0)
+        for _ in range(missing):
+            seed = random.getrandbits(63)
+            future = self.executor.submit(build_pool_map, node_count, radius, seed, self.directory)
+            future.add_done_callback(lambda f, d=difficulty: self._finished(d, f))
+
+    def _finished(self, difficulty, future):
+        with self.lock:
+            self.pending[difficulty] -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None:
+                path, seconds = future.result()
+                if self.closed:
+                    _unlink(path)
+                    return
+                self.ready[difficulty].append(path)
+                self.generated += 1
+                self.build_seconds += seconds
+                self.failed_in_row[difficulty] = 0
+                self.ready_changed.notify_all()
+                return
+            self.failures += 1
+            self.failed_in_row[difficulty] += 1
+            self.last_error[difficulty] = error
+            failed = self.failed_in_row[difficulty]
+            if self.closed:
+                return
+            if self._given_up(difficulty):
+                self.ready_changed.notify_all()
+        if self._given_up(difficulty):
+            print(f"Map pool: giving up on difficulty {difficulty} after {failed} failed builds: {error}")
+            return
+        delay = self.retry_delay * 2 ** (failed - 1)
+        print(f"Map pool: building a map for difficulty {difficulty} failed ({error}); retrying in {delay:g} s")
+        retry = threading.Timer(delay, self._refill, (difficulty,))
+        retry.daemon = True
+        retry.start()
+
+    def wait(self, timeout=None):
+        """Block until every difficulty has a map ready; False if `timeout` ran out first.
+
+        Raises RuntimeError, from the last build error, if a difficulty
+        without a ready map has been given up.
+        """
+        def settled():
+            return self.closed or all(self.ready[d] or self._given_up(d) for d in self.settings)
+
+        with self.ready_changed:
+            done = self.ready_changed.wait_for(settled, timeout)
+            for difficulty in self.settings:
+                if not self.ready[difficulty] and self._given_up(difficulty):
+                    raise RuntimeError(f"maps for difficulty {difficulty} failed to build "
+                                       f"{self.failed_in_row[difficulty]} times in a row") \
+                        from self.last_error[difficulty]
+            return done
+
+    def take(self, difficulty):
+        """A ready map for this difficulty, or a one-off map built on the spot if there is none."""
+        with self.lock:
+            path = self.ready[difficulty].popleft() if self.ready[difficulty] else None
+        self._refill(difficulty)
+        if path is not None:
+            game_map = load_map(path)
+            _unlink(path)
+            return game_map
+        node_count, radius = self.settings[difficulty]
+        return cached_map(node_count, radius)
+
+    def stats(self):
+        """Pool depth per difficulty and generation throughput so far."""
+        with self.lock:
+            elapsed = time.perf_counter() - self.started
+            return {
+                'ready': {d: len(q) for d, q in self.ready.items()},
+                'pending': dict(self.pending),
+                'generated': self.generated,
+                'failures': self.failures,
+                'maps_per_second': self.generated / elapsed if elapsed else 0.0,
+                'mean_build_seconds': self.build_seconds / self.generated if self.generated else 0.0,
+            }
+
+    def close(self):
+        """Stop building and delete the maps not taken; builds still running are discarded as they finish."""
+        with self.lock:
+            self.closed = True
+            self.ready_changed.notify_all()
+            ready = [path for paths in self.ready.values() for path in paths]
+            for paths in self.ready.values():
+                paths.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for path in ready:
+            _unlink(path)
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,275 @@
+# matplotlib_renderer.py
+import math
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import numpy as np
+from renderer import DIFFICULTY_NAMES, Renderer
+from spatial_index import GridIndex
+
+# Level of detail for the matplotlib graph view, by what is inside the view.
+LABEL_LIMIT = 100      # node numbers and full-size markers up to this many nodes
+WEIGHT_LIMIT = 60      # Hard-mode edge weights up to this many edges
+DETAIL_LIMIT = 4000    # beyond this many nodes or edges, draw the grid aggregate
+AGGREGATE_CELLS = 48   # aggregate grid cells per side of the view
+ZOOM_STEP = 1.25
+
+
+class MatplotlibRenderer(Renderer):
+    """Graph view whose static layers are redrawn only when the view moves.
+
+    Edges, nodes, node labels and Hard-mode weight labels are fixed artists
+    (a LineCollection, a PathCollection and two pools of Text) refilled
+    from the part of the map inside the axes limits, found with the spatial
+    index. How much is drawn follows the level-of-detail limits above: with
+    many nodes in view the labels and weights are hidden and markers
+    shrink, and past DETAIL_LIMIT nodes and edges are merged onto a grid of
+    AGGREGATE_CELLS per side. Every frame therefore draws a bounded number
+    of primitives whatever the map size. Scroll to zoom, drag with the
+    right button to pan.
+
+    A turn only moves the player and ghost markers and rewrites the HUD
+    strings. With `blit` (and a canvas that supports it) those are
+    animated artists: every full draw caches the static background, and
+    present() restores that background and redraws only the dynamic
+    artists. Other canvases fall back to an ordinary idle redraw.
+    """
+
+    def __init__(self, game, ax=None, blit=True):
+        super().__init__()
+        self.ax = ax if ax is not None else plt.gca()
+        self.canvas = self.ax.figure.canvas
+        self.positions = np.array([game.pos[node] for node in range(len(game.pos))], dtype=np.float64)
+        self.graph = game.graph
+        low, high = self.positions.min(axis=0), self.positions.max(axis=0)
+        self.index = getattr(game, 'node_index', None) or GridIndex(
+            self.positions, max(float((high - low).max()), 1e-9) / math.sqrt(len(self.positions)))
+
+        self.edges = LineCollection([], colors='gray', linewidths=1, alpha=0.5, zorder=1)
+        self.ax.add_collection(self.edges)
+        self.nodes = self.ax.scatter([], [], s=500, c='white', edgecolors='gray', zorder=2)
+        self.weight_labels = [self.ax.text(0, 0, "", fontsize=8, color='blue', ha='center', va='center',
+                                           rotation_mode='anchor', transform_rotates_text=True,
+                                           bbox=dict(boxstyle='round', ec='white', fc='white'),
+                                           zorder=1.5, clip_on=True, visible=False)
+                              for _ in range(WEIGHT_LIMIT if game.difficulty == 3 else 0)]
+        self.node_labels = [self.ax.text(0, 0, "", fontsize=12, ha='center', va='center', zorder=4,
+                                         clip_on=True, visible=False)
+                            for _ in range(LABEL_LIMIT)]
+        self.player = self.ax.scatter([0], [0], s=700, c='green', marker='o', zorder=3)
+        self.ghost = self.ax.scatter([0], [0], s=700, c='red', marker='h', zorder=3)
+
+        # Node numbers on top of the tokens, which cover the static labels.
+        self.player_label = self.ax.text(0, 0, "", ha='center', va='center', fontsize=12, zorder=5)
+        self.ghost_label = self.ax.text(0, 0, "", ha='center', va='center', fontsize=12, zorder=5)
+        self.sanity_text = self.ax.text(0.02, 0.004, "", transform=self.ax.transAxes, verticalalignment='top')
+        self.score_text = self.ax.text(0.02, 0.057, "", transform=self.ax.transAxes, verticalalignment='top')
+        self.message_texts = [self.ax.text(0.5, 1.05 + 0.03 * i, "", transform=self.ax.transAxes,
+                                           ha='center', va='bottom', fontsize=12)
+                              for i in range(self.messages.slots)]
+        self.ax.set_title(f'Ghost Game - {DIFFICULTY_NAMES[game.difficulty]} Mode')
+        self.ax.axis('off')
+
+        self.dynamic = [self.player, self.ghost, self.player_label, self.ghost_label,
+                        self.sanity_text, self.score_text] + self.message_texts
+        self.blit = blit and self.canvas.supports_blit
+        self.background = None
+        if self.blit:
+            for artist in self.dynamic:
+                artist.set_animated(True)
+            self.canvas.mpl_connect('draw_event', self._on_draw)
+
+        pad = np.maximum((high - low) * 0.05, 1e-3)
+        self.full_view = (low - pad, high + pad)
+        self.full_key = tuple(self.full_view[0]) + tuple(self.full_view[1])
+        self.full_layers = None
+        self.drag = None
+        self.setting_view = False
+        self.set_view(*self.full_view)
+        self.ax.callbacks.connect('xlim_changed', self._limits_changed)
+        self.ax.callbacks.connect('ylim_changed', self._limits_changed)
+        self.canvas.mpl_connect('scroll_event', self._on_scroll)
+        self.canvas.mpl_connect('button_press_event', self._on_press)
+        self.canvas.mpl_connect('motion_notify_event', self._on_motion)
+        self.canvas.mpl_connect('button_release_event', self._on_release)
+
+    def set_view(self, low, high):
+        """Show the layout box low..high and refill the static layers for it."""
+        self.setting_view = True
+        self.ax.set_xlim(low[0], high[0])
+        self.ax.set_ylim(low[1], high[1])
+        self.setting_view = False
+        self._layout_view()
+
+    def _layout_view(self):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        low, high = np.array([min(x0, x1), min(y0, y1)]), np.array([max(x0, x1), max(y0, y1)])
+        # The whole-map view is the slowest to lay out on big maps and the
+        # one zooming out returns to, so it is computed once and kept.
+        if tuple(low) + tuple(high) == self.full_key:
+            if self.full_layers is None:
+                self.full_layers = self._view_layers(low, high)
+            layers = self.full_layers
+        else:
+            layers = self._view_layers(low, high)
+        offsets, size, segments, labels, weights = layers
+
+        self.nodes.set_offsets(offsets)
+        self.nodes.set_sizes([size])
+        self.edges.set_segments(segments)
+        for i, text in enumerate(self.node_labels):
+            text.set_visible(i < len(labels))
+            if i < len(labels):
+                text.set_position(labels[i][0])
+                text.set_text(labels[i][1])
+        for i, text in enumerate(self.weight_labels):
+            text.set_visible(i < len(weights))
+            if i < len(weights):
+                text.set_position(weights[i][0])
+                text.set_rotation(weights[i][1])
+                text.set_text(weights[i][2])
+        self.canvas.draw_idle()
+
+    def _view_layers(self, low, high):
+        """Node offsets and size, edge segments, node labels and weight labels for the box."""
+        visible = self.index.within(low, high)
+        u, v, w = self._edges_near(visible)
+        if len(visible) > DETAIL_LIMIT or len(u) > DETAIL_LIMIT:
+            offsets, segments = self._aggregate(visible, u, v, low, (high - low) / AGGREGATE_CELLS)
+            return offsets, 10, segments, [], []
+
+        offsets = self.positions[visible]
+        size = 500 if len(visible) <= LABEL_LIMIT else max(10, 500 * LABEL_LIMIT / len(visible))
+        segments = np.stack([self.positions[u], self.positions[v]], axis=1)
+        labels = []
+        if len(visible) <= LABEL_LIMIT:
+            labels = [(self.positions[node], str(node + 1)) for node in visible.tolist()]
+        weights = []
+        if len(u) <= len(self.weight_labels):
+            for a, b, weight in zip(self.positions[u], self.positions[v], w.tolist()):
+                angle = math.degrees(math.atan2(b[1] - a[1], b[0] - a[0]))
+                angle = angle - 180 if angle > 90 else angle + 180 if angle < -90 else angle
+                weights.append(((a + b) / 2, angle, f"{weight:.2f}"))
+        return offsets, size, segments, labels, weights
+
+    def _edges_near(self, nodes):
+        """(u, v, weight) of every edge with an endpoint in `nodes`, each once."""
+        indptr, indices = self.graph.indptr, self.graph.indices
+        counts = indptr[nodes + 1] - indptr[nodes]
+        total = int(counts.sum())
+        k = np.repeat(indptr[nodes] - np.cumsum(counts) + counts, counts) + np.arange(total)
+        u, v = np.repeat(nodes, counts), indices[k].astype(np.int64)
+        inside = np.zeros(self.graph.node_count, dtype=bool)
+        inside[nodes] = True
+        keep = (u < v) | ~inside[v]
+        return u[keep], v[keep], self.graph.weights[k][keep]
+
+    def _aggregate(self, visible, u, v, low, cell):
+        """Far-zoom stand-ins: one marker per occupied grid cell, one segment per linked cell pair."""
+        count = AGGREGATE_CELLS * AGGREGATE_CELLS
+
+        def keys(nodes):
+            x, y = (self.positions[nodes] - low).T
+            x = np.clip((x / cell[0]).astype(np.int64), 0, AGGREGATE_CELLS - 1)
+            y = np.clip((y / cell[1]).astype(np.int64), 0, AGGREGATE_CELLS - 1)
+            return x * AGGREGATE_CELLS + y
+
+        def centres(keys):
+            return low + (np.column_stack([keys // AGGREGATE_CELLS, keys % AGGREGATE_CELLS]) + 0.5) * cell
+
+        occupied = np.zeros(count, dtype=bool)
+        occupied[keys(visible)] = True
+        ku, kv = keys(u), keys(v)
+        linked = np.zeros(count * count, dtype=bool)
+        linked[np.minimum(ku, kv) * count + np.maximum(ku, kv)] = True
+        linked[np.arange(count) * (count + 1)] = False
+        pairs = np.flatnonzero(linked)
+        return centres(np.flatnonzero(occupied)), np.stack([centres(pairs // count), centres(pairs % count)], axis=1)
+
+    def _limits_changed(self, ax):
+        # Limits set by the toolbar's zoom/pan tools; set_view() lays out itself.
+        if not self.setting_view:
+            self._layout_view()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        full = self.full_view[1] - self.full_view[0]
+        scale = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        scale = min(scale, full[0] / (x1 - x0), full[1] / (y1 - y0))
+        if scale >= 1 and (x1 - x0) * scale >= full[0] * 0.999:
+            self.set_view(*self.full_view)
+            return
+        centre = np.array([event.xdata, event.ydata])
+        self.set_view(centre + (np.array([x0, y0]) - centre) * scale,
+                      centre + (np.array([x1, y1]) - centre) * scale)
+
+    def _on_press(self, event):
+        if event.button == 3 and event.inaxes is self.ax:
+            self.drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_motion(self, event):
+        if self.drag is None:
+            return
+        x, y, (x0, x1), (y0, y1) = self.drag
+        dx = (event.x - x) * (x1 - x0) / self.ax.bbox.width
+        dy = (event.y - y) * (y1 - y0) / self.ax.bbox.height
+        self.set_view((x0 - dx, y0 - dy), (x1 - dx, y1 - dy))
+
+    def _on_release(self, event):
+        if event.button == 3:
+            self.drag = None
+
+    def update(self, game):
+        """Move the tokens and refresh the HUD for the current game state."""
+        self.player.set_offsets([game.pos[game.player_position-1]])
+        self.ghost.set_offsets([game.pos[game.ghost_position-1]])
+        self.player_label.set_position(game.pos[game.player_position-1])
+        self.player_label.set_text(str(game.player_position))
+        self.ghost_label.set_position(game.pos[game.ghost_position-1])
+        self.ghost_label.set_text(str(game.ghost_position))
+        self.sanity_text.set_text(f'Sanity: {game.sanity}')
+        self.score_text.set_text(f'Current Score: {game.current_score}')
+
+    def present(self):
+        """Put the current state (including queued status messages) on screen."""
+        for text, (message, color) in zip(self.message_texts, self.messages.visible()):
+            text.set_text(message)
+            text.set_color(color or 'blue')
+        if not self.blit:
+            self.canvas.draw_idle()
+            return
+        if self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_dynamic()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def run(self, on_click):
+        def on_press(event):
+            if event.button == 1:
+                on_click(event.xdata, event.ydata)
+
+        self.canvas.mpl_connect('button_press_event', on_press)
+        plt.show()
+
+    def close(self, delay_ms=0):
+        if delay_ms <= 0:
+            plt.close(self.ax.figure)
+            return
+        self.close_timer = self.canvas.new_timer(interval=delay_ms)
+        self.close_timer.single_shot = True
+        self.close_timer.add_callback(plt.close, self.ax.figure)
+        self.close_timer.start()
+
+    def _on_draw(self, event):
+        # A full draw (first frame, resize, view moved, other artists changed)
+        # renders only the static layers; cache them, then add the dynamic
+        # artists.
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._draw_dynamic()
+
+    def _draw_dynamic(self):
+        for artist in self.dynamic:
+            self.ax.draw_artist(artist)
@@ -0,0 +1,148 @@
+# pygame_renderer.py
+import math
+import numpy as np
+import pygame
+from renderer import DIFFICULTY_NAMES, Renderer
+
+COLORS = {
+    'background': (255, 255, 255),
+    'edge': (190, 190, 190),
+    'node': (128, 128, 128),
+    'text': (0, 0, 0),
+    'blue': (0, 0, 255),
+    'red': (220, 0, 0),
+    'green': (0, 128, 0),
+}
+# Posted by close() to end run().
+CLOSE_EVENT = pygame.USEREVENT + 1
+
+
+class PygameRenderer(Renderer):
+    """Graph view in a pygame window, updated with dirty rectangles.
+
+    The whole map (edges, nodes, labels, Hard-mode weights) is drawn once
+    onto a background surface. Each frame copies the background back only
+    under the rectangles the tokens and HUD covered last frame, draws them
+    at their new place and hands just those rectangles to
+    pygame.display.update(), so a frame costs the same on any map size.
+    present() is capped at `fps` frames per second (0 for no cap).
+    """
+
+    def __init__(self, game, size=(800, 800), fps=60, hud_height=90, margin=30):
+        super().__init__()
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(f'Ghost Game - {DIFFICULTY_NAMES[game.difficulty]} Mode')
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 16)
+
+        points = np.array([game.pos[node] for node in range(len(game.pos))], dtype=np.float64)
+        self.low = points.min(axis=0)
+        extent = max(float((points.max(axis=0) - self.low).max()), 1e-9)
+        side = min(size[0], size[1] - 2 * hud_height) - 2 * margin
+        self.scale = side / extent
+        self.map_rect = pygame.Rect((size[0] - side) // 2, hud_height + margin, side, side)
+        self.screen_points = self.to_screen(points)
+        spacing = side / math.sqrt(len(points))
+        self.node_radius = int(np.clip(spacing * 0.3, 2, 14))
+        self.token_radius = self.node_radius + max(2, self.node_radius // 4)
+
+        self.background = self._draw_map(game)
+        self.screen.blit(self.background, (0, 0))
+        pygame.display.flip()
+        self.dirty = []
+        self.tokens = []
+        self.hud = []
+
+    def to_screen(self, points):
+        """Layout coordinates -> integer pixel centres (y grows downward)."""
+        x = self.map_rect.left + (points[:, 0] - self.low[0]) * self.scale
+        y = self.map_rect.bottom - (points[:, 1] - self.low[1]) * self.scale
+        return np.column_stack([x, y]).round().astype(np.int64)
+
+    def to_layout(self, pixel):
+        """Pixel -> layout coordinates, or (None, None) outside the map area."""
+        if not self.map_rect.inflate(2 * self.token_radius, 2 * self.token_radius).collidepoint(pixel):
+            return None, None
+        x = self.low[0] + (pixel[0] - self.map_rect.left) / self.scale
+        y = self.low[1] + (self.map_rect.bottom - pixel[1]) / self.scale
+        return x, y
+
+    def _draw_map(self, game):
+        surface = pygame.Surface(self.screen.get_size())
+        surface.fill(COLORS['background'])
+        points = self.screen_points.tolist()
+        show_weights = game.difficulty == 3 and self.node_radius >= 10
+        for u, v, weight in zip(*(column.tolist() for column in game.graph.edges())):
+            pygame.draw.line(surface, COLORS['edge'], points[u], points[v])
+            if show_weights:
+                label = self.small_font.render(f"{weight:.2f}", True, COLORS['blue'], COLORS['background'])
+                middle = ((points[u][0] + points[v][0]) // 2, (points[u][1] + points[v][1]) // 2)
+                surface.blit(label, label.get_rect(center=middle))
+        for node, point in enumerate(points):
+            pygame.draw.circle(surface, COLORS['background'], point, self.node_radius)
+            pygame.draw.circle(surface, COLORS['node'], point, self.node_radius, 1)
+            if self.node_radius >= 8:
+                label = self.font.render(str(node + 1), True, COLORS['text'])
+                surface.blit(label, label.get_rect(center=point))
+        return surface
+
+    def update(self, game):
+        """Remember where the tokens go and what the HUD says this frame."""
+        self.tokens = [(game.player_position, COLORS['green'], 0),
+                       (game.ghost_position, COLORS['red'], 6)]
+        self.hud = [f'Sanity: {game.sanity}', f'Current Score: {game.current_score}']
+
+    def present(self):
+        """Redraw the dirty rectangles: old token/HUD areas and the new ones."""
+        for rect in self.dirty:
+            self.screen.blit(self.background, rect, rect)
+        drawn = [self._draw_token(*token) for token in self.tokens]
+        width, height = self.screen.get_size()
+        for i, (message, color) in enumerate(self.messages.visible()):
+            if message:
+                surface = self.font.render(message, True, COLORS.get(color, COLORS['blue']))
+                drawn.append(self.screen.blit(surface, surface.get_rect(midtop=(width // 2, 10 + 26 * i))))
+        for i, line in enumerate(self.hud):
+            surface = self.font.render(line, True, COLORS['text'])
+            drawn.append(self.screen.blit(surface, (10, height - 26 * (len(self.hud) - i))))
+        self.clock.tick(self.fps)
+        pygame.display.update(self.dirty + drawn)
+        self.dirty = drawn
+
+    def _draw_token(self, position, color, sides):
+        center = self.screen_points[position - 1].tolist()
+        if sides:
+            corners = [(center[0] + self.token_radius * math.cos(math.pi / 2 + 2 * math.pi * k / sides),
+                        center[1] + self.token_radius * math.sin(math.pi / 2 + 2 * math.pi * k / sides))
+                       for k in range(sides)]
+            rect = pygame.draw.polygon(self.screen, color, corners)
+        else:
+            rect = pygame.draw.circle(self.screen, color, center, self.token_radius)
+        if self.token_radius >= 8:
+            label = self.font.render(str(position), True, COLORS['text'])
+            rect = rect.union(self.screen.blit(label, label.get_rect(center=center)))
+        return rect
+
+    def run(self, on_click):
+        """Sleep in pygame.event.wait() and turn left clicks into on_click calls."""
+        while True:
+            event = pygame.event.wait()
+            if event.type in (pygame.QUIT, CLOSE_EVENT):
+                break
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                on_click(*self.to_layout(event.pos))
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.screen.blit(self.background, (0, 0))
+                self.dirty = [self.screen.get_rect()]
+                self.present()
+        pygame.display.quit()
+
+    def close(self, delay_ms=0):
+        if delay_ms > 0:
+            pygame.time.set_timer(CLOSE_EVENT, delay_ms, loops=1)
+        else:
+            pygame.event.post(pygame.event.Event(CLOSE_EVENT))
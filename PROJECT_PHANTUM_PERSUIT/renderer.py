@@ -0,0 +1,73 @@
+# renderer.py
+from abc import ABC, abstractmethod
+from collections import deque
+
+DIFFICULTY_NAMES = {1: 'Easy', 2: 'Medium', 3: 'Hard'}
+
+
+class StatusMessages:
+    """Queue of status lines shown above the map.
+
+    post() queues a message that stays up for `turns` turns; next_turn()
+    ages the queue and drops expired messages. At most `slots` messages are
+    kept (the newest), one per pooled HUD slot, so renderers can draw them
+    with a fixed set of artists however long the game runs.
+    """
+
+    def __init__(self, slots=3):
+        self.slots = slots
+        self.queue = deque(maxlen=slots)
+
+    def post(self, message, color='blue', turns=1):
+        self.queue.append([message, color, turns])
+
+    def next_turn(self):
+        for entry in self.queue:
+            entry[2] -= 1
+        live = [entry for entry in self.queue if entry[2] > 0]
+        self.queue.clear()
+        self.queue.extend(live)
+
+    def visible(self):
+        """(message, color) for every slot, newest first; empty slots are ("", None)."""
+        lines = [(message, color) for message, color, _ in reversed(self.queue)]
+        return lines + [("", None)] * (self.slots - len(lines))
+
+
+class Renderer(ABC):
+    """What Game needs from a view of the map.
+
+    update(game) takes the token positions and HUD values for the current
+    state, present() puts them (and the queued `messages`) on screen, run()
+    hands control to the view's event loop and calls on_click(x, y) with
+    layout coordinates (None when the click missed the map) until the view
+    is closed, and close() ends run() after `delay_ms`. ask() puts a yes/no
+    question to the player; unless the view overrides it, on the console.
+    A view missing one of the abstract methods cannot be created.
+    """
+
+    def __init__(self):
+        self.messages = StatusMessages()
+
+    @abstractmethod
+    def update(self, game):
+        pass
+
+    @abstractmethod
+    def present(self):
+        pass
+
+    @abstractmethod
+    def run(self, on_click):
+        pass
+
+    @abstractmethod
+    def close(self, delay_ms=0):
+        pass
+
+    def ask(self, question):
+        while True:
+            answer = input(f"{question} (y/n): ").strip().lower()
+            if answer in ('y', 'n'):
+                return answer == 'y'
+            print("Invalid input. Please enter 'y' or 'n'.")
@@ -0,0 +1,80 @@
+# routing.py
+from collections import OrderedDict
+from heapq import heappush, heappop
+import numpy as np
+from bfs_engine import BFSEngine
+
+# Memory the columns of one NextHopTable may take (each is 4 bytes per node).
+COLUMN_CACHE_BYTES = 64 * 2**20
+
+
+class NextHopTable:
+    """Next step from any node toward a goal, one column per goal node.
+
+    A column is filled by a single search outward from the goal the first
+    time that goal is asked for, then kept, so the ghost only pays for the
+    nodes the player actually stands on. Columns are kept up to `max_bytes`
+    in all; past that the one used longest ago is dropped, and rebuilt if
+    its goal comes up again. Unweighted tables use a BFS (fewest hops);
+    weighted ones run Dijkstra over the CSRGraph edge weights.
+    """
+
+    def __init__(self, graph, weighted=False, engine=None, max_bytes=COLUMN_CACHE_BYTES):
+        self.graph = graph
+        self.weighted = weighted
+        self.max_bytes = max_bytes
+        self.columns = OrderedDict()
+        self.nbytes = 0
+        if not weighted and engine is None:
+            engine = BFSEngine(graph)
+        self.engine = engine
+
+    def next_hop(self, start, goal):
+        if start == goal:
+            return start
+        column = self.columns.get(goal)
+        if column is None:
+            column = self._add_column(goal, self._build_column(goal))
+        else:
+            self.columns.move_to_end(goal)
+        hop = column[start]
+        return start if hop < 0 else int(hop)
+
+    def _add_column(self, goal, column):
+        self.columns[goal] = column
+        self.nbytes += column.nbytes
+        # The newest column is kept even if it alone is over the budget.
+        while self.nbytes > self.max_bytes and len(self.columns) > 1:
+            _, dropped = self.columns.popitem(last=False)
+            self.nbytes -= dropped.nbytes
+        return column
+
+    def clear(self):
+        self.columns.clear()
+        self.nbytes = 0
+
+    def _build_column(self, goal):
+        if not self.weighted:
+            self.engine.search(goal)
+            return self.engine.parents_array()
+        column = np.full(self.graph.node_count, -1, dtype=np.int32)
+        column[goal] = goal
+        self._dijkstra_from(goal, column)
+        return column
+
+    def _dijkstra_from(self, goal, column):
+        indptr, indices, weights = self.graph.offsets, self.graph.targets, self.graph.costs
+        dist = [float('inf')] * self.graph.node_count
+        dist[goal] = 0.0
+        heap = [(0.0, goal)]
+        while heap:
+            d, current = heappop(heap)
+            if d > dist[current]:
+                continue
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                nd = d + weights[k]
+                if nd < dist[neighbor]:
+                    dist[neighbor] = nd
+                    column[neighbor] = current
+                    heappush(heap, (nd, neighbor))
@@ -0,0 +1,86 @@
+# sound_bank.py
+import os
+from collections import deque
+
+SOUND_DIR = "Sound"
+SOUND_EXTENSIONS = (".mp3", ".ogg", ".wav")
+
+
+class SoundBank:
+    """Sound effects decoded once and played on reserved mixer channels.
+
+    Each file in `directory` is decoded into a pygame Sound the first time
+    it is played (or all at once by preload()) and kept. play() starts it on
+    one of `channels` mixer channels reserved for effects and returns at
+    once. Names are matched case-insensitively by file name, so
+    "sound/end.mp3 " finds Sound/end.mp3. With `silent=True`, or when no
+    audio device can be opened, every call is a no-op and the game runs
+    without sound.
+    """
+
+    def __init__(self, directory=SOUND_DIR, channels=4, silent=False):
+        self.directory = directory
+        self.channel_count = channels
+        self.silent = silent
+        self.sounds = {}
+        self.channels = None
+        # Indices of the reserved channels, the one started longest ago first.
+        self.started = deque(range(channels))
+
+    def _open(self):
+        if self.silent or self.channels is not None:
+            return not self.silent
+        try:
+            import pygame
+        except ImportError as err:
+            print(f"Sound disabled: {err}")
+            self.silent = True
+            return False
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.channel_count))
+            pygame.mixer.set_reserved(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            self.files = {name.lower(): os.path.join(self.directory, name)
+                          for name in os.listdir(self.directory)
+                          if name.lower().endswith(SOUND_EXTENSIONS)}
+        except (OSError, pygame.error) as err:
+            print(f"Sound disabled: {err}")
+            self.silent = True
+        return not self.silent
+
+    def load(self, name):
+        """The decoded Sound for `name`, or None if there is no such file."""
+        if not self._open():
+            return None
+        key = os.path.basename(name.strip()).lower()
+        if key not in self.sounds:
+            import pygame
+            self.sounds[key] = None
+            path = self.files.get(key)
+            if path is None:
+                print(f"Sound not found: {name}")
+            else:
+                try:
+                    self.sounds[key] = pygame.mixer.Sound(path)
+                except pygame.error as err:
+                    print(f"Could not load {path}: {err}")
+        return self.sounds[key]
+
+    def preload(self):
+        """Decode every file in the sound directory now rather than on first play."""
+        if self._open():
+            for key in self.files:
+                self.load(key)
+
+    def play(self, name):
+        sound = self.load(name)
+        if sound is None:
+            return
+        # Prefer an idle reserved channel; when all are busy, cut off the
+        # one that was started longest ago.
+        index = next((i for i, channel in enumerate(self.channels) if not channel.get_busy()), self.started[0])
+        self.started.remove(index)
+        self.started.append(index)
+        self.channels[index].play(sound)
@@ -0,0 +1,125 @@
+# spatial_index.py
+import numpy as np
+
+# Points handled per vectorised block in pairs_within, to bound peak memory.
+BLOCK_SIZE = 100000
+
+
+class GridIndex:
+    """Uniform grid over 2-D points for fixed-radius neighbour searches.
+
+    Points are bucketed into square cells of side `cell_size` and stored
+    sorted by cell, so the members of any cell are one contiguous slice.
+    """
+
+    def __init__(self, points, cell_size):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.origin = self.points.min(axis=0) if len(self.points) else np.zeros(2)
+        cells = self._cells_of(self.points)
+        self.shape = tuple(int(c) for c in cells.max(axis=0) + 1) if len(self.points) else (1, 1)
+        keys = cells[:, 0] * self.shape[1] + cells[:, 1]
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_x, self.cell_y = cells[self.order, 0], cells[self.order, 1]
+        counts = np.bincount(keys, minlength=self.shape[0] * self.shape[1])
+        self.cell_start = np.zeros(counts.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.cell_start[1:])
+
+    def _cells_of(self, points):
+        return np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+
+    def _cell_slice(self, cx, cy):
+        """Start/stop of the sorted members of cells (cx, cy); empty when off-grid."""
+        inside = (cx >= 0) & (cx < self.shape[0]) & (cy >= 0) & (cy < self.shape[1])
+        keys = np.where(inside, cx * self.shape[1] + cy, 0)
+        start = self.cell_start[keys]
+        stop = np.where(inside, self.cell_start[keys + 1], start)
+        return start, stop
+
+    def _members(self, cx, cy):
+        """Original indices of every point in the given cells."""
+        start, stop = self._cell_slice(cx, cy)
+        counts = stop - start
+        total = counts.sum()
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+        return self.order[offsets + np.arange(total)]
+
+    def nearest(self, point, max_distance=np.inf, labels=None, exclude=None):
+        """Index of the point closest to `point`, or -1 if none is within max_distance.
+
+        Cells are scanned in square rings around the query cell and the search
+        stops once no unscanned ring can hold anything closer. With `labels`,
+        points whose label equals `exclude` are ignored.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        if not len(self.points):
+            return -1
+        cx, cy = self._cells_of(point[None, :])[0]
+        reach = max(abs(cx), abs(cy), abs(self.shape[0] - 1 - cx), abs(self.shape[1] - 1 - cy))
+        best, best_distance = -1, max_distance
+        for ring in range(reach + 1):
+            if best_distance <= (ring - 1) * self.cell_size:
+                break
+            side = np.arange(-ring, ring + 1)
+            if ring == 0:
+                dx, dy = np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+            else:
+                inner = side[1:-1]
+                dx = np.concatenate([side, side, np.full(inner.size, -ring), np.full(inner.size, ring)])
+                dy = np.concatenate([np.full(side.size, -ring), np.full(side.size, ring), inner, inner])
+            candidates = self._members(cx + dx, cy + dy)
+            if labels is not None and candidates.size:
+                candidates = candidates[labels[candidates] != exclude]
+            if not candidates.size:
+                continue
+            distances = np.hypot(*(self.points[candidates] - point).T)
+            k = distances.argmin()
+            if distances[k] <= best_distance:
+                best, best_distance = int(candidates[k]), float(distances[k])
+        return best
+
+    def within(self, low, high):
+        """Indices of every point inside the box low <= p <= high."""
+        low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+        if not len(self.points):
+            return np.empty(0, dtype=np.int64)
+        first = np.maximum(self._cells_of(low[None, :])[0], 0)
+        last = np.minimum(self._cells_of(high[None, :])[0], np.array(self.shape) - 1)
+        if (last < first).any():
+            return np.empty(0, dtype=np.int64)
+        cx, cy = np.meshgrid(np.arange(first[0], last[0] + 1), np.arange(first[1], last[1] + 1), indexing='ij')
+        candidates = self._members(cx.ravel(), cy.ravel())
+        inside = ((self.points[candidates] >= low) & (self.points[candidates] <= high)).all(axis=1)
+        return candidates[inside]
+
+    def pairs_within(self, radius):
+        """Every pair (u, v), u < v, of points at most `radius` apart.
+
+        Only the cell itself and four of its eight neighbours are scanned
+        for each point, so every pair is generated exactly once.
+        """
+        if radius > self.cell_size:
+            raise ValueError("radius must not exceed the grid cell size")
+        found_u, found_v = [], []
+        for first in range(0, len(self.order), BLOCK_SIZE):
+            rows = np.arange(first, min(first + BLOCK_SIZE, len(self.order)))
+            for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+                start, stop = self._cell_slice(self.cell_x[rows] + dx, self.cell_y[rows] + dy)
+                if (dx, dy) == (0, 0):
+                    start = np.maximum(start, rows + 1)
+                counts = np.maximum(stop - start, 0)
+                total = counts.sum()
+                if total == 0:
+                    continue
+                left = np.repeat(rows, counts)
+                right = np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(total)
+                u, v = self.order[left], self.order[right]
+                close = np.hypot(*(self.points[u] - self.points[v]).T) <= radius
+                found_u.append(u[close])
+                found_v.append(v[close])
+        if not found_u:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        u, v = np.concatenate(found_u), np.concatenate(found_v)
+        return np.minimum(u, v), np.maximum(u, v)
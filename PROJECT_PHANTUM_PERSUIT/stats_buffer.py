@@ -0,0 +1,273 @@
+# stats_buffer.py
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+from stats_store import StatsError, StatsStore, apply_delta, stats_delta
+
+# Longest wait between flush retries while the store keeps failing.
+MAX_RETRY_SECONDS = 60.0
+
+
+def _lock(file):
+    """Take an exclusive lock on `file` without waiting; False if another process holds one."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _is_current(file, path):
+    """Whether `path` still names the open `file`, i.e. it was not replaced or removed meanwhile."""
+    try:
+        return os.stat(path).st_ino == os.fstat(file.fileno()).st_ino
+    except FileNotFoundError:
+        return False
+
+
+class StatsBuffer(StatsStore):
+    """Write-behind front for another StatsStore.
+
+    add() appends the delta to a local journal file, fsyncs it and
+    returns; the delta is then folded into one pending delta per player.
+    A worker thread hands the pending deltas to store.add_many() every
+    `flush_every` seconds, or as soon as `flush_rows` players are pending,
+    and removes the flushed entries from the journal once the batch has
+    committed. load() includes the deltas not flushed yet. While the
+    store keeps failing, the worker retries after twice as long each time,
+    up to MAX_RETRY_SECONDS; the error is printed once, and kept in
+    `last_error` until a flush succeeds again.
+
+    The journal belongs to one process, which holds an exclusive flock on
+    it while running; a StatsBuffer on a journal another process has open
+    raises StatsError. Entries left by a crash are replayed into the next
+    StatsBuffer: from `journal_path` itself, and from every journal
+    matching the `orphans` glob pattern whose lock can be taken, i.e. whose
+    process is gone. Replayed journals are moved into this one and
+    deleted, so an add() that returned is not lost; a crash between a
+    batch's commit and the journal rewrite, or during a replay, applies
+    those entries a second time. A journal with nothing left in it is
+    deleted by close(). Without fcntl (Windows) nothing is locked and
+    `orphans` is ignored.
+    """
+
+    def __init__(self, store, journal_path, flush_every=1.0, flush_rows=64, history=1000, orphans=None):
+        self.store = store
+        self.journal_path = journal_path
+        self.flush_every = flush_every
+        self.flush_rows = flush_rows
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        # Held for a whole flush, so load() never sees a batch both in the
+        # store and still pending.
+        self.flush_lock = threading.Lock()
+        self.pending = {}
+        self.closed = False
+        self.batch_sizes = deque(maxlen=history)
+        self.latencies = deque(maxlen=history)
+        self.failures = 0
+        self.last_error = None
+        self._recover(orphans)
+        self.thread = threading.Thread(target=self._run, name="stats-flush", daemon=True)
+        self.thread.start()
+
+    def _recover(self, orphans):
+        own = open(self.journal_path, 'a+b')
+        if not _lock(own):
+            own.close()
+            raise StatsError(f"{self.journal_path} is in use by another process")
+        replayed = []
+        try:
+            own.seek(0)
+            self._replay(own)
+            paths = sorted(glob.glob(orphans)) if orphans and fcntl is not None else []
+            for path in paths:
+                if os.path.abspath(path) == os.path.abspath(self.journal_path):
+                    continue
+                try:
+                    file = open(path, 'rb')
+                except FileNotFoundError:  # replayed by another process meanwhile
+                    continue
+                # Locked by its live process, or by one replaying it now; or
+                # already replayed and deleted after we opened it.
+                if not _lock(file) or not _is_current(file, path):
+                    file.close()
+                    continue
+                replayed.append((path, file))
+                self._replay(file)
+            if fcntl is None:  # Windows cannot replace a file that is open
+                own.close()
+            # Rewritten from the parsed entries, so a torn line is not glued to the next add().
+            self._rewrite(b"".join(self._entry(player, delta) for player, delta in self.pending.items()))
+            # Only now that their entries are safely in this journal.
+            for path, _ in replayed:
+                os.unlink(path)
+        finally:
+            for _, file in replayed:
+                file.close()
+            own.close()
+
+    def _replay(self, file):
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:  # torn last write
+                continue
+            self._fold(entry['player'], entry['delta'])
+
+    @staticmethod
+    def _entry(player, delta):
+        return json.dumps({'player': player, 'delta': delta}).encode() + b"\n"
+
+    def _fold(self, player, delta):
+        apply_delta(self.pending.setdefault(player, stats_delta()), delta)
+
+    def _rewrite(self, data):
+        # The new file is locked before it replaces the journal, so the
+        # journal is never unlocked while this process runs.
+        temp_path = self.journal_path + ".tmp"
+        file = open(temp_path, 'wb')
+        try:
+            _lock(file)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+            if fcntl is None:  # Windows cannot replace a file that is open
+                file.close()
+                os.replace(temp_path, self.journal_path)
+                file = open(self.journal_path, 'ab')
+            else:
+                os.replace(temp_path, self.journal_path)
+        except BaseException:
+            file.close()
+            raise
+        self.journal = file
+
+    def load(self, player):
+        with self.flush_lock:
+            stats = self.store.load(player)
+            with self.lock:
+                delta = self.pending.get(player)
+                if delta is not None:
+                    apply_delta(stats, delta)
+        return stats
+
+    def add(self, player, delta):
+        with self.lock:
+            if self.closed:
+                raise StatsError("stats buffer is closed")
+            try:
+                self.journal.write(self._entry(player, delta))
+                self.journal.flush()
+                os.fsync(self.journal.fileno())
+            except OSError as err:
+                raise StatsError(err) from err
+            self._fold(player, delta)
+            # While the store is failing, the worker retries on its own schedule.
+            if len(self.pending) >= self.flush_rows and self.last_error is None:
+                self.wake.notify()
+
+    def add_many(self, deltas):
+        for player, delta in deltas:
+            self.add(player, delta)
+
+    def flush(self):
+        """Write the pending deltas to the store as one batch now; returns the number of players written."""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+                flushed_to = self.journal.tell()
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            try:
+                self.store.add_many(sorted(batch.items()))
+            except StatsError as err:
+                with self.lock:
+                    self.failures += 1
+                    self.last_error = err
+                    for player, delta in batch.items():
+                        self._fold(player, delta)
+                raise
+            latency = time.perf_counter() - start
+            with self.lock:
+                self.batch_sizes.append(len(batch))
+                self.latencies.append(latency)
+                # Keep only what was added while the batch was being written.
+                journal = self.journal
+                try:
+                    with open(self.journal_path, 'rb') as file:
+                        file.seek(flushed_to)
+                        data = file.read()
+                    if fcntl is None:
+                        journal.close()
+                    self._rewrite(data)
+                except OSError as err:
+                    if journal.closed:
+                        self.journal = open(self.journal_path, 'ab')
+                    self.last_error = StatsError(err)
+                    raise self.last_error from err
+                journal.close()
+                self.last_error = None
+            return len(batch)
+
+    def _run(self):
+        delay = self.flush_every
+        while True:
+            with self.lock:
+                failing = self.last_error is not None
+                if not self.closed and (failing or len(self.pending) < self.flush_rows):
+                    self.wake.wait(delay)
+                if self.closed:
+                    return
+            try:
+                self.flush()
+            except StatsError as err:
+                if not failing:
+                    print(f"Error flushing stats: {err}; retrying in the background")
+                delay = min(delay * 2, MAX_RETRY_SECONDS)
+                continue
+            if failing:
+                print("Stats flushed again")
+            delay = self.flush_every
+
+    def report(self):
+        """One line on the flushes so far: how many, rows per batch and latency."""
+        with self.lock:
+            sizes, latencies, failures = list(self.batch_sizes), list(self.latencies), self.failures
+        if not sizes:
+            return f"Stats flushes: none ({failures} failed)"
+        return (f"Stats flushes: {len(sizes)}, {sum(sizes) / len(sizes):.1f} players per batch "
+                f"(max {max(sizes)}), latency mean {sum(latencies) / len(latencies) * 1000:.2f} ms, "
+                f"worst {max(latencies) * 1000:.2f} ms, {failures} failed")
+
+    def close(self):
+        """Stop the worker, flush what is pending and close the store.
+
+        Deltas that cannot be flushed stay in the journal for the next run;
+        an emptied journal is deleted.
+        """
+        with self.lock:
+            self.closed = True
+            self.wake.notify()
+        self.thread.join()
+        try:
+            self.flush()
+        except StatsError as err:
+            print(f"Error flushing stats: {err}")
+        if not self.pending:
+            try:
+                os.unlink(self.journal_path)
+            except OSError:  # Windows, where the open journal cannot be deleted
+                pass
+        self.journal.close()
+        self.store.close()
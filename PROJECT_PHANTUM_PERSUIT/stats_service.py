@@ -0,0 +1,54 @@
+# stats_service.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StatsService:
+    """A StatsStore used only from its own worker thread, so callers never wait on its I/O.
+
+    open_store() is run on the worker first; load() and add() queue the
+    store's method behind the calls already queued and return a Future,
+    whose result() re-raises the store's error, or the one from
+    open_store(). Calls run in the order they were made, so a load() sees
+    every add() made before it. prefetch() starts loading a player's stats
+    early, e.g. while the splash screen is up; the next load() of that
+    player returns the same future.
+    """
+
+    def __init__(self, open_store):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats")
+        self.opened = self.executor.submit(open_store)
+        self.lock = threading.Lock()
+        self.prefetched = {}
+
+    @property
+    def store(self):
+        """The store once it has opened, else None."""
+        if self.opened.done() and self.opened.exception() is None:
+            return self.opened.result()
+        return None
+
+    def _call(self, method, *args):
+        return self.executor.submit(lambda: getattr(self.opened.result(), method)(*args))
+
+    def prefetch(self, player):
+        with self.lock:
+            if player not in self.prefetched:
+                self.prefetched[player] = self._call('load', player)
+
+    def load(self, player):
+        with self.lock:
+            future = self.prefetched.pop(player, None)
+        return future or self._call('load', player)
+
+    def add(self, player, delta):
+        with self.lock:
+            # A prefetched load queued before this add would miss it.
+            self.prefetched.pop(player, None)
+            return self._call('add', player, delta)
+
+    def close(self):
+        """Wait for the queued calls, then close the store."""
+        self.executor.shutdown(wait=True)
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,199 @@
+# stats_store.py
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+from db_pool import ConnectionPool
+
+STATS_FIELDS = ("games_played", "total_score", "best_score", "hearts_of_dead")
+
+# The user_stats table of ghost_game.sql, for SQLite.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_stats (
+    player_name VARCHAR(50) PRIMARY KEY,
+    games_played INT DEFAULT 0,
+    total_score INT DEFAULT 0,
+    best_score INT DEFAULT 0,
+    hearts_of_dead INT DEFAULT 0
+)
+"""
+
+# StatsStore.add() as one statement; parameters are (player_name, *STATS_FIELDS).
+MYSQL_UPSERT = f"""
+INSERT INTO user_stats (player_name, {', '.join(STATS_FIELDS)}) VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    games_played = games_played + VALUES(games_played),
+    total_score = total_score + VALUES(total_score),
+    best_score = GREATEST(best_score, VALUES(best_score)),
+    hearts_of_dead = hearts_of_dead + VALUES(hearts_of_dead)
+"""
+SQLITE_UPSERT = f"""
+INSERT INTO user_stats (player_name, {', '.join(STATS_FIELDS)}) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (player_name) DO UPDATE SET
+    games_played = games_played + excluded.games_played,
+    total_score = total_score + excluded.total_score,
+    best_score = MAX(best_score, excluded.best_score),
+    hearts_of_dead = hearts_of_dead + excluded.hearts_of_dead
+"""
+
+
+class StatsError(Exception):
+    """A stats store could not load or save; wraps the backend's own error."""
+
+
+def new_stats():
+    """Stats of a player who has not played yet."""
+    return dict.fromkeys(STATS_FIELDS, 0)
+
+
+def stats_delta(**changes):
+    """A change to a player's stats for StatsStore.add(); fields not given are 0."""
+    return {**new_stats(), **changes}
+
+
+def apply_delta(stats, delta):
+    """Apply `delta` to the `stats` dict in place, as StatsStore.add() does to the stored row."""
+    for field in STATS_FIELDS:
+        if field == 'best_score':
+            stats[field] = max(stats[field], delta[field])
+        else:
+            stats[field] += delta[field]
+
+
+class StatsStore(ABC):
+    """Where players' stats are kept.
+
+    load() returns a player's stats as a dict keyed by STATS_FIELDS, or
+    new_stats() for a player not stored yet. add() applies a stats_delta()
+    in one atomic write: games_played, total_score and hearts_of_dead are
+    increased by the delta and best_score raised to the delta's if that is
+    higher, creating the player's row if needed. Because a write only adds
+    to what is stored, two sessions of the same player never overwrite
+    each other's results. Both raise StatsError when the backend fails,
+    and a store missing either cannot be created.
+    """
+
+    @abstractmethod
+    def load(self, player):
+        pass
+
+    @abstractmethod
+    def add(self, player, delta):
+        pass
+
+    def add_many(self, deltas):
+        """add() each (player, delta) pair; stores that can do it in one transaction override this."""
+        for player, delta in deltas:
+            self.add(player, delta)
+
+    def close(self):
+        pass
+
+
+class MemoryStatsStore(StatsStore):
+    """Stats kept in a dict for the life of the process; for tests and offline play."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = {}
+
+    def load(self, player):
+        with self.lock:
+            return dict(self.rows.get(player) or new_stats())
+
+    def add(self, player, delta):
+        with self.lock:
+            apply_delta(self.rows.setdefault(player, new_stats()), delta)
+
+    def add_many(self, deltas):
+        with self.lock:
+            for player, delta in deltas:
+                apply_delta(self.rows.setdefault(player, new_stats()), delta)
+
+
+class SQLStatsStore(StatsStore):
+    """Stats in a user_stats table reached through a ConnectionPool.
+
+    The pool's connections must be in autocommit mode: load() is one
+    SELECT and add() one upsert statement, each a single round trip.
+    add_many() runs the upsert with executemany() in one transaction,
+    opened by begin(raw). `param` is the driver's placeholder,
+    `upsert_sql` the driver's upsert taking (player_name, *STATS_FIELDS)
+    and `errors` the exception types it raises; those are re-raised as
+    StatsError.
+    """
+
+    def __init__(self, pool, param, upsert_sql, errors, begin):
+        self.pool = pool
+        self.errors = errors
+        self.begin = begin
+        self.select_sql = (f"SELECT {', '.join(STATS_FIELDS)} FROM user_stats "
+                           f"WHERE player_name = {param}")
+        self.upsert_sql = upsert_sql
+
+    def load(self, player):
+        try:
+            with self.pool.connection() as db:
+                rows = db.execute(self.select_sql, (player,)).fetchall()
+        except self.errors as err:
+            raise StatsError(err) from err
+        return dict(zip(STATS_FIELDS, rows[0])) if rows else new_stats()
+
+    def add(self, player, delta):
+        try:
+            with self.pool.connection() as db:
+                db.execute(self.upsert_sql, (player,) + tuple(delta[field] for field in STATS_FIELDS))
+        except self.errors as err:
+            raise StatsError(err) from err
+
+    def add_many(self, deltas):
+        rows = [(player,) + tuple(delta[field] for field in STATS_FIELDS) for player, delta in deltas]
+        try:
+            with self.pool.connection() as db:
+                self.begin(db.raw)
+                db.executemany(self.upsert_sql, rows)
+                db.commit()
+        except self.errors as err:
+            raise StatsError(err) from err
+
+    def close(self):
+        self.pool.close()
+
+
+class MySQLStatsStore(SQLStatsStore):
+    """Stats in the ghost_game MySQL database; `config` is passed to mysql.connector.connect().
+
+    Raises StatsError if mysql-connector-python is not installed.
+    """
+
+    def __init__(self, config, pool_size=4):
+        try:
+            import mysql.connector
+        except ImportError as err:
+            raise StatsError(f"MySQL driver not installed: {err}") from err
+
+        pool = ConnectionPool(lambda: mysql.connector.connect(autocommit=True, **config), size=pool_size,
+                              prepare=lambda db: db.cursor(prepared=True),
+                              ping=lambda db: db.ping(reconnect=False))
+        super().__init__(pool, "%s", MYSQL_UPSERT, mysql.connector.Error,
+                         begin=lambda db: db.start_transaction())
+
+
+class SQLiteStatsStore(SQLStatsStore):
+    """Stats in a local SQLite file, created with SQLITE_SCHEMA if missing.
+
+    The file is put in WAL mode, so a write does not block other
+    connections reading stats, and commits with synchronous=NORMAL, which
+    in WAL mode can lose the last commits only on power loss, not when the
+    process dies.
+    """
+
+    def __init__(self, path="ghost_game.db", pool_size=4, timeout=5.0):
+        def connect():
+            db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(SQLITE_SCHEMA)
+            return db
+
+        super().__init__(ConnectionPool(connect, size=pool_size), "?", SQLITE_UPSERT, sqlite3.Error,
+                         begin=lambda db: db.execute("BEGIN"))
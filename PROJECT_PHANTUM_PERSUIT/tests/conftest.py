@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+
+import matplotlib
+import pytest
+
+matplotlib.use('Agg')
+# The game modules are flat scripts in the directory above.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    parser.addoption('--runslow', action='store_true', help="also run the tests marked slow")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "slow: takes minutes; run with --runslow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--runslow'):
+        return
+    skip = pytest.mark.skip(reason="slow; run with --runslow")
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def game(monkeypatch):
+    """A silent Game on the in-memory stats store, ready for play() once a renderer_factory is set."""
+    import final2
+
+    random.seed(0)
+    monkeypatch.setattr(final2, 'STATS_BACKEND', 'memory')
+    monkeypatch.setattr(final2.sounds, 'silent', True)
+    game = final2.Game('tester')
+    game.reset_stats()
+    game.begin(1)
+    return game
@@ -0,0 +1,48 @@
+from map_generator import generate_map
+from text_renderer import TextRenderer
+
+
+class ScriptedTextRenderer(TextRenderer):
+    """TextRenderer whose run() moves to the first neighbour `turns` times, keeping the player alive."""
+
+    def __init__(self, game, turns):
+        super().__init__(game)
+        self.game = game
+        self.turns = turns
+
+    def run(self, on_click):
+        game = self.game
+        for _ in range(self.turns):
+            game.sanity, game.hearts_of_dead = 100, 1
+            on_click(*self.positions[game.get_neighbors(game.player_position)[0] - 1])
+
+    def ask(self, question):
+        return True
+
+
+def test_play_without_sanity_records_no_game(game):
+    saved = []
+    game.save_user_stats = saved.append
+    game.reset_stats()
+    game.play()
+    assert saved == []
+
+
+def test_each_game_starts_with_its_own_history_and_map(game):
+    class Pool:
+        def take(self, difficulty):
+            taken.append(difficulty)
+            return generate_map(24, 0.2, seed=len(taken))
+
+    taken = []
+    game.map_pool = Pool()
+    game.save_user_stats = lambda delta: None
+    maps = []
+    for difficulty in (1, 3):
+        game.reset_stats()
+        game.begin(difficulty)
+        game.renderer_factory = lambda game: ScriptedTextRenderer(game, turns=3)
+        game.play()
+        maps.append(game.graph)
+        assert len(game.history) == 3
+    assert taken == [1, 3] and maps[0] is not maps[1]
@@ -0,0 +1,90 @@
+import sys
+
+import matplotlib.pyplot as plt
+import pytest
+
+from matplotlib_renderer import MatplotlibRenderer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+class ScriptedRenderer(MatplotlibRenderer):
+    """Agg view whose run() clicks a node next to the player, `turns` times.
+
+    The player is kept alive (sanity and a Heart of the Dead topped up
+    before every click) so the session lasts all the turns; the number of
+    artists on the axes and of queued messages is recorded after each one,
+    and peak RSS after turn `warm_up` and at the end. With `keep_history`
+    off the move history, which is the replay and grows by design, is
+    emptied every turn so that only the view's memory is measured.
+    """
+
+    def __init__(self, game, turns, warm_up=0, keep_history=True):
+        super().__init__(game, ax=plt.figure(figsize=(4, 4)).add_subplot())
+        self.game = game
+        self.turns = turns
+        self.warm_up = warm_up
+        self.keep_history = keep_history
+        self.closed = False
+        self.artists = []
+        self.queued = []
+        self.rss = []
+
+    def run(self, on_click):
+        game = self.game
+        for turn in range(1, self.turns + 1):
+            if self.closed:
+                break
+            game.sanity, game.hearts_of_dead = 100, 1
+            x, y = game.pos[game.get_neighbors(game.player_position)[0] - 1]
+            on_click(x, y)
+            if not self.keep_history:
+                game.history.clear()
+            self.artists.append(len(self.ax.get_children()))
+            self.queued.append(len(self.messages.queue))
+            if resource is not None and turn in (self.warm_up, self.turns):
+                self.rss.append(peak_rss_mb())
+
+    def close(self, delay_ms=0):
+        self.closed = True
+
+    def ask(self, question):
+        return True
+
+
+def test_hud_artists_stay_fixed_over_a_long_session(game):
+    """A quick run of the check below; too short for RSS to level off, so only artists are checked."""
+    game.renderer_factory = lambda game: ScriptedRenderer(game, turns=300)
+    game.play()
+    renderer = game.renderer
+    plt.close('all')
+    assert len(game.history) == 300
+    assert set(renderer.artists) == {renderer.artists[0]}
+    assert max(renderer.queued) <= renderer.messages.slots
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(resource is None, reason="peak RSS is read with the resource module")
+def test_hud_artists_and_memory_stay_flat_over_10000_turns(game):
+    # About 25 ms a turn, mostly Agg text rendering, so this takes minutes.
+    # Memory is compared from turn 3000: until then RSS still grows as
+    # matplotlib's text-metrics cache (an LRU of 4096 entries) fills with
+    # the new score strings, and stays flat after.
+    game.renderer_factory = lambda game: ScriptedRenderer(game, turns=10000, warm_up=3000,
+                                                          keep_history=False)
+    game.play()
+    renderer = game.renderer
+    plt.close('all')
+    assert len(renderer.artists) == 10000
+    assert set(renderer.artists) == {renderer.artists[0]}
+    assert max(renderer.queued) <= renderer.messages.slots
+    warm, final = renderer.rss
+    assert final - warm < 2.0, f"peak RSS grew from {warm:.1f} to {final:.1f} MB"
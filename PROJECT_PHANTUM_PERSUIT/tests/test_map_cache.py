@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+import map_cache
+from map_cache import cached_map, load_map, map_path, save_map
+from map_generator import generate_map
+
+
+def test_map_from_another_generator_version_is_a_miss(tmp_path, monkeypatch):
+    path = map_path(24, 0.2, 7, str(tmp_path))
+    stale = generate_map(24, 0.2, seed=8)
+    monkeypatch.setattr(map_cache, 'GENERATOR_VERSION', map_cache.GENERATOR_VERSION - 1)
+    save_map(stale, path)
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match="version"):
+        load_map(path)
+
+    game_map = cached_map(24, 0.2, seed=7, cache_dir=str(tmp_path))
+    assert np.array_equal(game_map.positions, generate_map(24, 0.2, seed=7).positions)
+    assert np.array_equal(load_map(path).positions, game_map.positions)
@@ -0,0 +1,24 @@
+import math
+
+import numpy as np
+import pytest
+
+from bfs_engine import BFSEngine
+from map_generator import generate_map
+
+
+def sparse_radius(nodes):
+    """Half the radius that keeps a map mostly connected, so most maps need repair."""
+    return 0.1 if nodes <= 24 else 0.75 * math.sqrt(math.log(nodes) / (math.pi * nodes))
+
+
+@pytest.mark.parametrize('nodes, seeds', [(1, 5), (2, 5), (24, 50), (500, 20), (5000, 3)])
+def test_repair_connects_every_map_with_distinct_edges(nodes, seeds):
+    for seed in range(seeds):
+        game_map = generate_map(nodes, sparse_radius(nodes), seed=seed)
+        engine = BFSEngine(game_map.graph)
+        engine.search(0)
+        assert all(engine.reached(node) for node in range(nodes)), seed
+        # Two components may pick the same bridge from either end.
+        u, v, _ = game_map.graph.edges()
+        assert len(np.unique(np.stack([u, v], axis=1), axis=0)) == len(u), seed
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from map_pool import MapPool
+
+
+def test_pool_gives_up_failing_difficulty_and_removes_its_files():
+    # A map without nodes cannot be built, so difficulty 2 fails every time.
+    pool = MapPool({1: (24, 0.2), 2: (0, 0.2)}, depth=1, workers=2, max_failures=3, retry_delay=0.01)
+    try:
+        with pytest.raises(RuntimeError, match="difficulty 2"):
+            pool.wait(60)
+        assert pool.stats()['failures'] == 3
+        [ready] = os.listdir(pool.directory)
+        assert pool.take(1).node_count == 24
+        assert ready not in os.listdir(pool.directory)
+    finally:
+        pool.close()
+    assert not os.path.exists(pool.directory)
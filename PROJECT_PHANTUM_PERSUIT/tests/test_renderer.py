@@ -0,0 +1,18 @@
+import pytest
+
+from renderer import Renderer
+
+
+def test_renderer_missing_a_method_cannot_be_created():
+    class NoClose(Renderer):
+        def update(self, game):
+            pass
+
+        def present(self):
+            pass
+
+        def run(self, on_click):
+            pass
+
+    with pytest.raises(TypeError, match="close"):
+        NoClose()
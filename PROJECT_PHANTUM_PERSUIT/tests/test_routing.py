@@ -0,0 +1,20 @@
+import random
+
+import pytest
+
+from map_generator import generate_map
+from routing import NextHopTable
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+def test_column_cache_stays_within_budget(weighted):
+    graph = generate_map(300, 0.12, seed=1).graph
+    budget = 3 * 4 * graph.node_count
+    bounded = NextHopTable(graph, weighted=weighted, max_bytes=budget)
+    unbounded = NextHopTable(graph, weighted=weighted, max_bytes=float('inf'))
+    rng = random.Random(0)
+    for _ in range(500):
+        start, goal = rng.randrange(graph.node_count), rng.randrange(40)
+        assert bounded.next_hop(start, goal) == unbounded.next_hop(start, goal)
+        assert bounded.nbytes <= budget and len(bounded.columns) <= 3
+    assert len(unbounded.columns) == 40
@@ -0,0 +1,31 @@
+from sound_bank import SoundBank
+
+
+class FakeChannel:
+    """Stands in for a pygame mixer Channel: busy from play() until finish()."""
+
+    def __init__(self):
+        self.sound = None
+
+    def get_busy(self):
+        return self.sound is not None
+
+    def play(self, sound):
+        self.sound = sound
+
+    def finish(self):
+        self.sound = None
+
+
+def test_busy_channels_cut_off_the_oldest_sound():
+    bank = SoundBank(channels=3)
+    bank.channels = [FakeChannel() for _ in range(3)]
+    bank.load = lambda name: name
+    for name in ("a", "b", "c"):
+        bank.play(name)
+    # "a" ends; its channel is reused, so "b" is now the oldest sound playing.
+    bank.channels[0].finish()
+    bank.play("d")
+    bank.play("e")
+    bank.play("f")
+    assert [channel.sound for channel in bank.channels] == ["d", "e", "f"]
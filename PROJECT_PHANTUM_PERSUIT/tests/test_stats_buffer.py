@@ -0,0 +1,91 @@
+import json
+import time
+
+import pytest
+
+from stats_buffer import StatsBuffer, fcntl
+from stats_store import MemoryStatsStore, StatsError, stats_delta
+
+
+def buffer(store, directory, name):
+    return StatsBuffer(store, str(directory / f"journal_{name}.jsonl"), flush_every=60,
+                       orphans=str(directory / "journal_*.jsonl"))
+
+
+@pytest.mark.skipif(fcntl is None, reason="journals are only locked where fcntl exists")
+def test_processes_keep_their_own_journals_and_replay_orphans(tmp_path):
+    store = MemoryStatsStore()
+    first = buffer(store, tmp_path, "first")
+    first.add("ann", stats_delta(games_played=1, total_score=10))
+    # Left by a process that crashed before flushing.
+    entry = {'player': "ann", 'delta': stats_delta(games_played=1, total_score=5)}
+    (tmp_path / "journal_crashed.jsonl").write_text(json.dumps(entry) + "\n")
+
+    second = buffer(store, tmp_path, "second")
+    second.add("bob", stats_delta(games_played=1, total_score=7))
+    # The crashed journal moved into the second one; the first is still its own.
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["journal_first.jsonl", "journal_second.jsonl"]
+    assert second.load("ann")['total_score'] == 5
+    with pytest.raises(StatsError, match="in use"):
+        buffer(store, tmp_path, "first")
+
+    first.close()
+    second.close()
+    assert store.load("ann")['total_score'] == 15
+    assert store.load("bob")['total_score'] == 7
+    assert list(tmp_path.iterdir()) == []
+
+
+class FlakyStore(MemoryStatsStore):
+    """MemoryStatsStore whose add_many() fails while `down` is set, counting the attempts."""
+
+    def __init__(self):
+        super().__init__()
+        self.down = True
+        self.attempts = 0
+
+    def add_many(self, deltas):
+        self.attempts += 1
+        if self.down:
+            raise StatsError("database is down")
+        super().add_many(deltas)
+
+
+def test_failing_flushes_back_off_and_are_reported_once(tmp_path, capsys):
+    store = FlakyStore()
+    stats = StatsBuffer(store, str(tmp_path / "journal.jsonl"), flush_every=0.02)
+    stats.add("ann", stats_delta(games_played=1))
+    time.sleep(1.0)
+    # 0.02 + 0.04 + ... doubles past 1 s after about 6 tries; without backoff it would be 50.
+    assert 2 <= store.attempts <= 7
+    assert str(stats.last_error) == "database is down"
+    assert capsys.readouterr().out.count("Error flushing stats") == 1
+
+    store.down = False
+    deadline = time.monotonic() + 5
+    while stats.last_error is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert stats.last_error is None
+    assert "Stats flushed again" in capsys.readouterr().out
+    assert store.load("ann")['games_played'] == 1
+    stats.close()
+
+
+def test_game_reports_the_buffer_flush_error(game, tmp_path, monkeypatch):
+    import final2
+    from stats_service import StatsService
+
+    store = FlakyStore()
+    service = StatsService(lambda: StatsBuffer(store, str(tmp_path / "journal.jsonl"), flush_every=0.02))
+    monkeypatch.setattr(final2, 'stats', service)
+    game.save_user_stats(stats_delta(games_played=1))
+    deadline = time.monotonic() + 5
+    while game.stats_error is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert str(game.stats_error) == "database is down"
+    # Clearing it once shown does not hide a flush that is still failing.
+    game.stats_error = None
+    assert game.stats_error is not None
+    store.down = False
+    service.close()
+    assert game.stats_error is None
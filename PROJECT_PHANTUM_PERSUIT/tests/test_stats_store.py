@@ -0,0 +1,30 @@
+import sys
+
+import pytest
+
+from stats_store import MySQLStatsStore, StatsError, StatsStore
+
+
+def test_mysql_store_without_driver_raises_stats_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'mysql.connector', None)
+    with pytest.raises(StatsError, match="driver"):
+        MySQLStatsStore({})
+
+
+def test_game_without_mysql_driver_starts_with_new_stats(game, monkeypatch):
+    import final2
+
+    monkeypatch.setitem(sys.modules, 'mysql.connector', None)
+    monkeypatch.setattr(final2, 'STATS_BACKEND', 'mysql')
+    monkeypatch.setattr(final2, 'stats', None)
+    game.load_user_stats()
+    assert game.user_stats == final2.new_stats()
+
+
+def test_store_missing_a_method_cannot_be_created():
+    class LoadOnly(StatsStore):
+        def load(self, player):
+            return {}
+
+    with pytest.raises(TypeError, match="add"):
+        LoadOnly()
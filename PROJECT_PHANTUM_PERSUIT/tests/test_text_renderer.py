@@ -0,0 +1,24 @@
+from text_renderer import TextRenderer
+
+
+class ScriptedTextRenderer(TextRenderer):
+    """TextRenderer whose run() types the same move to a non-adjacent node twice."""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.game = game
+
+    def run(self, on_click):
+        game = self.game
+        far = next(node for node in range(1, len(self.positions) + 1)
+                   if node != game.player_position and not game.is_valid_move(node))
+        for _ in range(2):
+            on_click(*self.positions[far - 1])
+
+
+def test_repeated_invalid_move_is_reported_each_time(game, capsys):
+    game.renderer_factory = ScriptedTextRenderer
+    game.play()
+    out = capsys.readouterr().out
+    assert out.count("Invalid move!") == 2
+    assert out.count("Adjacent nodes:") == 1
@@ -0,0 +1,61 @@
+# text_renderer.py
+from renderer import DIFFICULTY_NAMES, Renderer
+
+
+class TextRenderer(Renderer):
+    """Terminal view of the game for headless runs.
+
+    Each frame prints the status messages posted since the last frame,
+    even one repeating an earlier message, and the HUD lines (the player's
+    position, the nodes next to it) that changed. run() reads node numbers
+    from stdin and passes the node's layout position to on_click, so Game
+    handles a typed move exactly like a click. Imports nothing beyond the
+    standard library.
+    """
+
+    def __init__(self, game, prompt="Move to node (q to quit): "):
+        super().__init__()
+        self.positions = game.map.positions
+        self.prompt = prompt
+        self.closed = False
+        self.lines = []
+        self.printed = []
+        # The message queue entries already printed; compared by identity,
+        # since the same text may be posted again.
+        self.shown = []
+        print(f"Ghost Game - {DIFFICULTY_NAMES[game.difficulty]} Mode, {len(self.positions)} nodes")
+
+    def update(self, game):
+        """Remember the HUD lines for the current game state."""
+        self.lines = [
+            f"You: {game.player_position}  Ghost: {game.ghost_position}  "
+            f"Sanity: {game.sanity}  Current Score: {game.current_score}",
+            "Adjacent nodes: " + ", ".join(str(node) for node in game.get_neighbors(game.player_position)),
+        ]
+
+    def present(self):
+        for entry in self.messages.queue:
+            if entry[0] and not any(entry is shown for shown in self.shown):
+                print(entry[0])
+        self.shown = list(self.messages.queue)
+        for line in self.lines:
+            if line not in self.printed:
+                print(line)
+        self.printed = self.lines
+
+    def run(self, on_click):
+        """Read moves until close() is called, stdin ends or the player quits."""
+        while not self.closed:
+            try:
+                answer = input(self.prompt).strip().lower()
+            except EOFError:
+                break
+            if answer in ('q', 'quit'):
+                break
+            if answer.isdigit() and 1 <= int(answer) <= len(self.positions):
+                on_click(*self.positions[int(answer) - 1])
+            else:
+                print(f"Enter a node number from 1 to {len(self.positions)}.")
+
+    def close(self, delay_ms=0):
+        self.closed = True
@@ -0,0 +1,47 @@
+# tk_renderer.py
+import tkinter as tk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib_renderer import MatplotlibRenderer
+
+
+class TkRenderer(MatplotlibRenderer):
+    """The matplotlib graph view embedded in a GameApp window.
+
+    The figure lives on a FigureCanvasTkAgg inside the app's board frame
+    rather than in a pyplot window. run() waits for close() in a nested
+    wait_variable() on the app's root, so Game.play() keeps its blocking
+    shape while the app's one Tk event loop goes on handling the board,
+    and ask() puts the question under the board instead of on the console.
+    Clicks are ignored while a question is open and once the game has ended.
+    """
+
+    def __init__(self, game, app, figsize=(7, 7)):
+        figure = Figure(figsize=figsize)
+        self.widget = FigureCanvasTkAgg(figure, master=app.board).get_tk_widget()
+        super().__init__(game, ax=figure.add_subplot())
+        self.app = app
+        self.closed = tk.BooleanVar(app.root, False)
+        self.asking = False
+        self.widget.pack(fill='both', expand=True)
+
+    def run(self, on_click):
+        def on_press(event):
+            if event.button == 1 and not self.asking and not self.closed.get():
+                on_click(event.xdata, event.ydata)
+
+        self.canvas.mpl_connect('button_press_event', on_press)
+        self.app.wait(self.closed, True)
+
+    def close(self, delay_ms=0):
+        self.app.root.after(delay_ms, self.closed.set, True)
+
+    def ask(self, question):
+        self.asking = True
+        try:
+            return self.app.ask(question)
+        finally:
+            self.asking = False
+
+    def destroy(self):
+        self.widget.destroy()